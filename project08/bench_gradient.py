@@ -0,0 +1,54 @@
+import os
+import sys
+import time
+
+# Run without a real window
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from guess_the_number_pygame import build_gradient
+
+RESOLUTIONS = [(1920, 1080), (2560, 1440), (3840, 2160)]
+FRAMES = 30
+
+
+def draw_rows(screen, width, height):
+    # The per-row loop draw() used before the gradient was cached
+    for y in range(height):
+        color_value = int(180 + (y / height) * 50)
+        pygame.draw.rect(screen, (color_value, color_value, color_value), (0, y, width, 1))
+
+
+def time_frames(frame, frames):
+    start = time.perf_counter()
+    for _ in range(frames):
+        frame()
+    return (time.perf_counter() - start) / frames * 1000
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else FRAMES
+    pygame.display.init()
+
+    print(f"{'resolution':>12} {'row loop ms':>12} {'cached ms':>10} {'build ms':>9} {'speedup':>8} {'identical':>9}")
+    for width, height in RESOLUTIONS:
+        screen = pygame.display.set_mode((width, height))
+
+        row_ms = time_frames(lambda: draw_rows(screen, width, height), frames)
+        expected = screen.copy()
+
+        start = time.perf_counter()
+        background = build_gradient(width, height)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        cached_ms = time_frames(lambda: screen.blit(background, (0, 0)), frames)
+        identical = pygame.image.tobytes(screen, "RGB") == pygame.image.tobytes(expected, "RGB")
+
+        print(f"{width}x{height:<7} {row_ms:12.3f} {cached_ms:10.3f} {build_ms:9.3f} {row_ms / cached_ms:7.1f}x {str(identical):>9}")
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
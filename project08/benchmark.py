@@ -0,0 +1,262 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+# Benchmarks run without a real window
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from pygame.locals import *
+
+from game_engine import GameEngine, PLAYING
+from guess_the_number_pygame import NumberGuessingGame
+from telemetry import FORMATS, TelemetryExporter
+
+RESOLUTIONS = {"1080p": (1920, 1080), "1440p": (2560, 1440), "4k": (3840, 2160)}
+DEFAULT_MAX_REGRESSION = 0.10  # Allowed slowdown of a median against the baseline
+
+
+def time_calls(function, repeat, warmup=3):
+    # Milliseconds per call for each of `repeat` calls, after a few warmup calls
+    for _ in range(warmup):
+        function()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def summarize(samples, per=1):
+    # per: operations done by one sample, so results are always per operation
+    samples = sorted(sample / per for sample in samples)
+    return {
+        "median_ms": statistics.median(samples),
+        "mean_ms": statistics.fmean(samples),
+        "p95_ms": samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+        "max_ms": samples[-1],
+        "samples": len(samples),
+    }
+
+
+def play_misses(game, count):
+    # Make `count` wrong guesses so the history list is full
+    guess = game.min_number
+    while count and game.state == PLAYING:
+        if guess != game.secret_number:
+            game.check_guess(guess)
+            count -= 1
+        guess += 1
+
+
+# Screens to time draw() on: name -> function that puts the game into that screen
+def show_difficulty_selection(game):
+    game.back_to_menu()
+
+
+def show_playing_full_history(game):
+    game.select_difficulty("HARD")
+    play_misses(game, 12)
+    game.guess = "123"
+
+
+def show_game_over(game):
+    game.select_difficulty("EASY")
+    game.check_guess(game.secret_number)
+
+
+def show_paused_menu(game):
+    show_playing_full_history(game)
+    game.game_paused = True
+    game.menu_open = True
+
+
+SCREENS = {
+    "difficulty_selection": show_difficulty_selection,
+    "playing_full_history": show_playing_full_history,
+    "game_over": show_game_over,
+    "paused_menu": show_paused_menu,
+}
+
+
+def count_allocations(game, frames=10):
+    # Surfaces created per steady-state draw(): new layer surfaces plus text renders
+    allocations = game.compositor.allocations
+    game.text_cache.reset_counters()
+    for _ in range(frames):
+        game.draw()
+    return (game.compositor.allocations - allocations + game.text_cache.misses) / frames
+
+
+def layer_bytes(game):
+    # Pixel memory held by the retained layers and the cached gradient
+    background = game.background.get_pitch() * game.background.get_height() if game.background else 0
+    return game.compositor.stats()["bytes"] + background
+
+
+def event_flood(game, count):
+    # Typing, deleting and clicking on empty space: lots of work, no state change
+    width, height = game.display.get_size()
+    events = []
+    for i in range(count // 4):
+        key = K_0 + i % 10
+        events.append(pygame.event.Event(KEYDOWN, key=key, mod=0, unicode=chr(key)))
+        events.append(pygame.event.Event(KEYDOWN, key=K_BACKSPACE, mod=0, unicode=""))
+        events.append(pygame.event.Event(MOUSEMOTION, pos=(width // 2, height - 5), rel=(1, 0), buttons=(0, 0, 0)))
+        events.append(pygame.event.Event(MOUSEBUTTONDOWN, pos=(width // 2, height - 5), button=1))
+    return events
+
+
+def bench_frames(resolutions, frames, render_scale=1.0):
+    results = {}
+    for label, size in resolutions.items():
+        game = NumberGuessingGame(size=size, fullscreen=False, seed=1, render_scale=render_scale)
+        if render_scale != 1.0:
+            label = f"{label}@{render_scale:g}"  # Kept apart from full-resolution results
+        for screen, show in SCREENS.items():
+            game.game_paused = False
+            game.menu_open = False
+            show(game)
+            result = summarize(time_calls(game.draw, frames))
+            result["surfaces_per_frame"] = count_allocations(game)
+            result["layer_bytes"] = layer_bytes(game)
+            results[f"draw/{screen}/{label}"] = result
+
+        # handle_events with a flood of synthetic input while playing
+        show_playing_full_history(game)
+        events = event_flood(game, 1000)
+        samples = time_calls(lambda: game.handle_events(events), max(5, frames // 5))
+        results[f"handle_events/flood_1000/{label}"] = summarize(samples, per=len(events))
+    return results
+
+
+def bench_check_guess(rounds, telemetry=None):
+    # Raw engine speed: wrong guesses until every round is lost, then a new round
+    engine = GameEngine(seed=1, telemetry=telemetry)
+    engine.select_difficulty("HARD")
+    guesses_per_round = engine.game.max_attempts
+
+    def play_rounds():
+        for _ in range(rounds):
+            engine.restart()
+            wrong = engine.game.secret_number + 1
+            while engine.game.state == PLAYING:
+                engine.check_guess(wrong)
+
+    samples = time_calls(play_rounds, 10, warmup=1)
+    return summarize(samples, per=rounds * guesses_per_round)
+
+
+def guess_frame_events():
+    # One frame of play: type a guess, submit it, and restart if the round just ended
+    return [pygame.event.Event(KEYDOWN, key=key, mod=0, unicode=chr(key)) for key in (K_1, K_0, K_RETURN, K_r)]
+
+
+def bench_game_loop(size, frames, telemetry=None):
+    # handle_events + draw with a guess every frame, the path the exporter hooks into
+    game = NumberGuessingGame(size=size, fullscreen=False, seed=1, telemetry=telemetry)
+    game.select_difficulty("HARD")
+    events = guess_frame_events()
+
+    def frame():
+        game.handle_events(events)
+        game.draw()
+
+    return summarize(time_calls(frame, frames))
+
+
+def bench_telemetry(rounds, frames):
+    # The same engine and game-loop benchmarks with an exporter attached, per format
+    results = {
+        "check_guess/HARD": bench_check_guess(rounds),
+        "game_loop/guess_every_frame/1080p": bench_game_loop(RESOLUTIONS["1080p"], frames),
+    }
+    with tempfile.TemporaryDirectory() as directory:
+        for format in FORMATS:
+            exporter = TelemetryExporter(os.path.join(directory, f"telemetry.{format}"), format)
+            results[f"check_guess/HARD/telemetry_{format}"] = bench_check_guess(rounds, exporter)
+            results[f"game_loop/guess_every_frame/1080p/telemetry_{format}"] = \
+                bench_game_loop(RESOLUTIONS["1080p"], frames, exporter)
+            exporter.close()
+            print(f"telemetry {format}: {exporter.stats()}")
+    return results
+
+
+def compare(results, baseline, max_regression, thresholds):
+    # Returns (name, baseline ms, current ms, allowed fraction) for every regression
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        allowed = thresholds.get(name, max_regression)
+        before, after = baseline[name]["median_ms"], result["median_ms"]
+        if after > before * (1 + allowed):
+            regressions.append((name, before, after, allowed))
+    return regressions
+
+
+def parse_threshold(text):
+    name, _, fraction = text.rpartition("=")
+    if not name:
+        raise argparse.ArgumentTypeError("expected NAME=FRACTION")
+    return name, float(fraction)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Frame-time and throughput benchmarks under the SDL dummy driver")
+    parser.add_argument("--resolution", action="append", choices=sorted(RESOLUTIONS),
+                        help="resolution to benchmark (repeatable, default: all)")
+    parser.add_argument("--frames", type=int, default=60, help="draw() calls timed per screen")
+    parser.add_argument("--render-scale", type=float, default=1.0, metavar="SCALE",
+                        help="internal render scale passed to the game")
+    parser.add_argument("--rounds", type=int, default=2000, help="engine rounds per check_guess sample")
+    parser.add_argument("--output", default="benchmark_results.json", help="where to write the results")
+    parser.add_argument("--baseline", help="earlier results file to compare medians against")
+    parser.add_argument("--max-regression", type=float, default=DEFAULT_MAX_REGRESSION,
+                        help="allowed slowdown as a fraction, e.g. 0.1 for 10%%")
+    parser.add_argument("--threshold", action="append", type=parse_threshold, default=[],
+                        metavar="NAME=FRACTION", help="override the allowed slowdown for one benchmark")
+    args = parser.parse_args()
+
+    resolutions = {label: RESOLUTIONS[label] for label in (args.resolution or RESOLUTIONS)}
+    results = bench_frames(resolutions, args.frames, args.render_scale)
+    results.update(bench_telemetry(args.rounds, args.frames))
+    pygame.quit()
+
+    for name, result in results.items():
+        line = f"{name:<56} median {result['median_ms']:10.4f} ms   p95 {result['p95_ms']:10.4f} ms"
+        if "surfaces_per_frame" in result:
+            line += f"   {result['surfaces_per_frame']:.1f} surfaces/frame   {result['layer_bytes'] / 2 ** 20:.1f} MiB layers"
+        print(line)
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "platform": platform.platform(),
+            "video_driver": os.environ["SDL_VIDEODRIVER"],
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.max_regression, dict(args.threshold))
+        for name, before, after, allowed in regressions:
+            print(f"REGRESSION {name}: {before:.4f} ms -> {after:.4f} ms (allowed +{allowed:.0%})")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
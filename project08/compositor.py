@@ -0,0 +1,52 @@
+import pygame
+
+UNPAINTED = object()  # Key of a layer surface nothing has been painted on yet
+
+
+class Compositor:
+    # Retained layers for drawing a frame. Each layer is one pooled surface that is
+    # repainted only when its key (what it shows) or its size changes, so a frame
+    # that only blits layers allocates no new surfaces.
+    def __init__(self):
+        self.layers = {}  # name -> [surface, key]
+        self.allocations = 0
+        self.repaints = 0
+        self.frame_allocations = 0
+        self.frame_repaints = 0
+
+    def begin_frame(self):
+        self.frame_allocations = 0
+        self.frame_repaints = 0
+
+    def layer(self, name, key, size, paint, flags=0, like=None):
+        # The surface for `name`, after calling paint(surface) if it is out of date.
+        # like: surface whose pixel format the layer should share, so blits are plain copies
+        entry = self.layers.get(name)
+        if entry is None or entry[0].get_size() != size:
+            surface = pygame.Surface(size, flags, like) if like is not None else pygame.Surface(size, flags)
+            entry = self.layers[name] = [surface, UNPAINTED]
+            self.allocations += 1
+            self.frame_allocations += 1
+        if entry[1] != key:
+            paint(entry[0])
+            entry[1] = key
+            self.repaints += 1
+            self.frame_repaints += 1
+        return entry[0]
+
+    def clear(self):
+        self.layers.clear()
+
+    def stats(self):
+        layers = {
+            name: {"size": surface.get_size(), "bytes": surface.get_pitch() * surface.get_height()}
+            for name, (surface, key) in self.layers.items()
+        }
+        return {
+            "layers": layers,
+            "bytes": sum(layer["bytes"] for layer in layers.values()),
+            "allocations": self.allocations,
+            "repaints": self.repaints,
+            "frame_allocations": self.frame_allocations,
+            "frame_repaints": self.frame_repaints,
+        }
@@ -0,0 +1,57 @@
+import json
+import os
+
+import pygame
+
+from stats_store import DATA_DIR
+
+# SysFont scans every installed font (through fc-list on Linux) the first time
+# it is called in a process. The file it settles on for each name and style is
+# kept here, so later starts open the font file directly.
+FONT_CACHE = os.path.join(DATA_DIR, "fonts.json")
+
+
+class FontCache:
+    def __init__(self, path=FONT_CACHE):
+        self.path = path
+        self.entries = {}
+        self.changed = False
+        try:
+            with open(path) as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            pass  # Missing or corrupt cache: resolve again
+
+    def resolve(self, name, bold=False):
+        # (font file or None for pygame's default font, whether to fake bold)
+        key = f"{name}:{'bold' if bold else 'regular'}"
+        entry = self.entries.get(key)
+        if entry is not None and (entry[0] is None or os.path.exists(entry[0])):
+            return tuple(entry)
+
+        # Let SysFont make the choice, so the same file and styling is used as before
+        def capture(path, size, fake_bold, fake_italic):
+            return path, fake_bold
+
+        entry = pygame.font.SysFont(name, 0, bold, constructor=capture)
+        self.entries[key] = list(entry)
+        self.changed = True
+        return entry
+
+    def load(self, name, size, bold=False):
+        path, fake_bold = self.resolve(name, bold)
+        font = pygame.font.Font(path, size)
+        if fake_bold:
+            font.set_bold(True)
+        return font
+
+    def save(self):
+        if not self.changed:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, "w") as f:
+                json.dump(self.entries, f, indent=2)
+            self.changed = False
+        except OSError:
+            pass  # A read-only home only costs the font scan on the next start
@@ -0,0 +1,227 @@
+import math
+import random
+import time
+from functools import lru_cache
+
+# Game states
+SELECT_DIFFICULTY = "SELECT_DIFFICULTY"
+PLAYING = "PLAYING"
+GAME_OVER = "GAME_OVER"
+
+# Difficulty levels
+DIFFICULTY = {
+    "EASY": {"min": 1, "max": 50, "attempts": 10},
+    "MEDIUM": {"min": 1, "max": 100, "attempts": 15},
+    "HARD": {"min": 1, "max": 200, "attempts": 25}
+}
+
+# Hot/cold bands: a miss lands in the first band whose threshold (a fraction of
+# max_number) is at least the distance to the secret, otherwise it is COLD
+BANDS = ("VERY_HOT", "HOT", "WARM", "COOL", "COLD")
+BAND_THRESHOLDS = (0.05, 0.1, 0.2, 0.3)
+VERY_HOT_LIMIT, HOT_LIMIT, WARM_LIMIT, COOL_LIMIT = BAND_THRESHOLDS
+BAND_FEEDBACK = {
+    "VERY_HOT": "Very hot! 🔥",
+    "HOT": "Hot! 🔥",
+    "WARM": "Warm 😊",
+    "COOL": "Cool ❄️",
+    "COLD": "Cold! ❄️❄️"
+}
+
+# Largest custom range the input box and tracker are meant for
+MAX_CUSTOM_NUMBER = 10 ** 18
+# Largest attempt limit; stats_store keeps a round's attempts and guesses as 16-bit counts
+MAX_ATTEMPTS = 65535
+
+# check_guess results besides the band names
+WIN = "WIN"
+LOSE = "LOSE"
+
+
+def classify(difference, max_number):
+    # Map the distance between a guess and the secret to its hot/cold band
+    if difference <= max_number * VERY_HOT_LIMIT:  # Within 5% of range
+        return "VERY_HOT"
+    if difference <= max_number * HOT_LIMIT:  # Within 10% of range
+        return "HOT"
+    if difference <= max_number * WARM_LIMIT:  # Within 20% of range
+        return "WARM"
+    if difference <= max_number * COOL_LIMIT:  # Within 30% of range
+        return "COOL"
+    return "COLD"
+
+
+def add_difficulty(name, min_number, max_number, attempts):
+    # Register a custom difficulty alongside EASY/MEDIUM/HARD
+    if not 1 <= min_number < max_number <= MAX_CUSTOM_NUMBER:
+        raise ValueError(f"range must satisfy 1 <= min < max <= {MAX_CUSTOM_NUMBER}")
+    if not 1 <= attempts <= MAX_ATTEMPTS:
+        raise ValueError(f"attempts must be between 1 and {MAX_ATTEMPTS}")
+    DIFFICULTY[name] = {"min": min_number, "max": max_number, "attempts": attempts}
+
+
+@lru_cache(maxsize=64)
+def band_distances(max_number):
+    # Smallest and largest distance from the guess each band allows. classify()
+    # compares integers against max_number * threshold, so flooring the product
+    # gives exactly the same boundaries.
+    limits = [math.floor(max_number * threshold) for threshold in BAND_THRESHOLDS]
+    near = dict(zip(BANDS, [1] + [limit + 1 for limit in limits]))
+    far = dict(zip(BANDS, limits + [math.inf]))  # A typed guess can lie outside the range
+    return near, far
+
+
+class FeasibilityTracker:
+    # The secrets still consistent with every hint so far. A higher/lower hint
+    # together with its band confines the secret to one interval, so the set
+    # stays a single inclusive interval: O(1) per guess whatever the range size.
+    __slots__ = ("low", "high", "near", "far")
+
+    def __init__(self, min_number, max_number):
+        self.low = min_number
+        self.high = max_number
+        self.near, self.far = band_distances(max_number)
+
+    def is_possible(self, guess):
+        return self.low <= guess <= self.high
+
+    def update(self, guess, band, higher):
+        near, far = self.near[band], self.far[band]
+        if higher:
+            self.low = max(self.low, guess + near)
+            self.high = min(self.high, guess + far)
+        else:
+            self.low = max(self.low, guess - far)
+            self.high = min(self.high, guess - near)
+
+    def found(self, secret):
+        self.low = self.high = secret
+
+    @property
+    def remaining(self):
+        return max(0, self.high - self.low + 1)
+
+
+class GameState:
+    # Everything one round needs, kept in slots so thousands of them stay small
+    __slots__ = (
+        "state", "difficulty", "min_number", "max_number", "max_attempts",
+        "secret_number", "attempts", "win", "guess_history", "last_guess", "notice",
+        "candidates", "ruled_out", "started_at", "duration"
+    )
+
+    def __init__(self):
+        self.state = SELECT_DIFFICULTY
+        self.difficulty = None
+        self.min_number = None
+        self.max_number = None
+        self.max_attempts = None
+        self.secret_number = None
+        self.attempts = 0
+        self.win = False
+        self.guess_history = []  # (guess, band) for every miss that got a hint
+        self.last_guess = None
+        self.notice = None  # Message that overrides the computed one until the next guess
+        self.candidates = None  # FeasibilityTracker for the current round
+        self.ruled_out = False  # Whether the last guess was already excluded by earlier hints
+        self.started_at = None
+        self.duration = None  # Seconds the round took, once it is over
+
+
+class GameEngine:
+    # The game rules, free of any pygame dependency. Pass a seeded random.Random
+    # (or a seed) to make the secret numbers reproducible, a clock to time rounds,
+    # and optionally a telemetry.TelemetryExporter to receive every guess and round.
+    __slots__ = ("rng", "clock", "game", "telemetry")
+
+    def __init__(self, rng=None, seed=None, clock=time.monotonic, telemetry=None):
+        self.rng = rng if rng is not None else random.Random(seed)
+        self.clock = clock
+        self.game = GameState()
+        self.telemetry = telemetry
+
+    def reset_game(self):
+        game = self.game
+        game.attempts = 0
+        game.win = False
+        game.guess_history = []
+        game.last_guess = None
+        game.notice = None
+        game.ruled_out = False
+        game.duration = None
+
+        if game.difficulty:
+            diff = DIFFICULTY[game.difficulty]
+            game.min_number = diff["min"]
+            game.max_number = diff["max"]
+            game.max_attempts = diff["attempts"]
+            game.secret_number = self.rng.randint(game.min_number, game.max_number)
+            game.candidates = FeasibilityTracker(game.min_number, game.max_number)
+            game.started_at = self.clock()
+
+        if self.telemetry is not None:
+            self.telemetry.on_reset(game)
+
+    def select_difficulty(self, difficulty):
+        self.game.difficulty = difficulty
+        self.game.state = PLAYING
+        self.reset_game()
+
+    def restart(self):
+        # New round with the same difficulty
+        self.game.state = PLAYING
+        self.reset_game()
+
+    def back_to_menu(self):
+        self.game.state = SELECT_DIFFICULTY
+        self.game.difficulty = None
+        self.reset_game()
+
+    def check_guess(self, guess):
+        # Returns WIN, LOSE or the hot/cold band of the miss
+        game = self.game
+        game.attempts += 1
+        game.last_guess = guess
+        game.notice = None
+        game.ruled_out = not game.candidates.is_possible(guess)
+
+        if guess == game.secret_number:
+            game.candidates.found(guess)
+            game.win = True
+            game.state = GAME_OVER
+            game.duration = self.clock() - game.started_at
+            result = WIN
+        elif game.attempts >= game.max_attempts:
+            game.state = GAME_OVER
+            game.duration = self.clock() - game.started_at
+            result = LOSE
+        else:
+            result = classify(abs(guess - game.secret_number), game.max_number)
+            game.guess_history.append((guess, result))
+            game.candidates.update(guess, result, guess < game.secret_number)
+
+        if self.telemetry is not None:
+            self.telemetry.on_guess(game, result)
+        return result
+
+    def set_message(self, message):
+        self.game.notice = message
+
+    @property
+    def message(self):
+        # Built on demand so check_guess does no string formatting
+        game = self.game
+        if game.notice is not None:
+            return game.notice
+        if not game.difficulty:
+            return "Select a difficulty level"
+        if game.last_guess is None:
+            return f"Guess a number between {game.min_number} and {game.max_number}"
+        if game.win:
+            return f"Congratulations! You guessed the number in {game.attempts} attempts!"
+        if game.state == GAME_OVER:
+            return f"Game Over! The number was {game.secret_number}"
+
+        feedback = BAND_FEEDBACK[game.guess_history[-1][1]]
+        hint = "Higher 👆" if game.last_guess < game.secret_number else "Lower 👇"
+        return f"{feedback} Try {hint}. Attempts: {game.attempts}/{game.max_attempts}"
@@ -0,0 +1,142 @@
+import argparse
+import asyncio
+import random
+import time
+
+from game_engine import DIFFICULTY, GameEngine, LOSE, PLAYING, WIN
+
+# Line protocol, one command per line:
+#   NEW <difficulty>  -> OK <min> <max> <attempts>
+#   GUESS <number>    -> HINT <band> HIGHER|LOWER <attempts> <max_attempts> <candidates>
+#                        | WIN <attempts> | LOSE <secret>
+#   STATS             -> STATS active=<n> peak=<n> evicted=<n> guesses=<n> cpu=<seconds>
+#   QUIT              -> BYE
+# Anything else gets ERR <reason>. Idle sessions are sent BYE idle and closed.
+
+IDLE_TIMEOUT = 300.0  # Seconds without a command before a session is evicted
+
+
+class Session:
+    # Per-connection state; the engine's GameState carries the round itself
+    __slots__ = ("engine", "writer", "last_active")
+
+    def __init__(self, engine, writer):
+        self.engine = engine
+        self.writer = writer
+        self.last_active = time.monotonic()
+
+
+class GameServer:
+    def __init__(self, host="127.0.0.1", port=5050, idle_timeout=IDLE_TIMEOUT, seed=None):
+        self.host = host
+        self.port = port
+        self.idle_timeout = idle_timeout
+        self.rng = random.Random(seed)  # Shared by all sessions
+        self.sessions = set()
+        self.peak_sessions = 0
+        self.evicted = 0
+        self.guesses = 0
+
+    def handle_command(self, session, line):
+        command, _, argument = line.strip().partition(" ")
+        command = command.upper()
+        engine = session.engine
+
+        if command == "NEW":
+            difficulty = argument.strip().upper()
+            if difficulty not in DIFFICULTY:
+                return f"ERR unknown difficulty {difficulty or '-'}"
+            engine.select_difficulty(difficulty)
+            game = engine.game
+            return f"OK {game.min_number} {game.max_number} {game.max_attempts}"
+
+        if command == "GUESS":
+            game = engine.game
+            if game.state != PLAYING:
+                return "ERR no round in progress"
+            try:
+                guess = int(argument)
+            except ValueError:
+                return "ERR guess must be a number"
+            self.guesses += 1
+            result = engine.check_guess(guess)
+            if result == WIN:
+                return f"WIN {game.attempts}"
+            if result == LOSE:
+                return f"LOSE {game.secret_number}"
+            direction = "HIGHER" if guess < game.secret_number else "LOWER"
+            return f"HINT {result} {direction} {game.attempts} {game.max_attempts} {game.candidates.remaining}"
+
+        if command == "STATS":
+            return (f"STATS active={len(self.sessions)} peak={self.peak_sessions} evicted={self.evicted} "
+                    f"guesses={self.guesses} cpu={time.process_time():.3f}")
+
+        if command == "QUIT":
+            return "BYE"
+
+        return f"ERR unknown command {command or '-'}"
+
+    async def handle_client(self, reader, writer):
+        session = Session(GameEngine(rng=self.rng), writer)
+        self.sessions.add(session)
+        self.peak_sessions = max(self.peak_sessions, len(self.sessions))
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                session.last_active = time.monotonic()
+                reply = self.handle_command(session, line.decode("utf-8", "replace"))
+                writer.write(reply.encode() + b"\n")
+                if reply == "BYE":
+                    break
+                await writer.drain()
+        except (ConnectionError, ValueError):  # ValueError: line longer than the stream limit
+            pass
+        finally:
+            self.sessions.discard(session)
+            writer.close()
+
+    async def evict_idle_sessions(self):
+        # Close sessions that have not sent anything for idle_timeout seconds
+        while True:
+            await asyncio.sleep(min(self.idle_timeout / 2, 30))
+            cutoff = time.monotonic() - self.idle_timeout
+            for session in [session for session in self.sessions if session.last_active < cutoff]:
+                self.sessions.discard(session)
+                self.evicted += 1
+                session.writer.write(b"BYE idle\n")
+                session.writer.close()
+
+    async def serve(self, ready=None):
+        server = await asyncio.start_server(self.handle_client, self.host, self.port)
+        self.port = server.sockets[0].getsockname()[1]
+        print(f"listening on {self.host}:{self.port}", flush=True)
+        if ready is not None:
+            ready.set()
+        reaper = asyncio.create_task(self.evict_idle_sessions())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            reaper.cancel()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the number guessing game over a TCP line protocol")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5050, help="0 picks a free port")
+    parser.add_argument("--idle-timeout", type=float, default=IDLE_TIMEOUT,
+                        help="seconds of silence before a session is closed")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    server = GameServer(args.host, args.port, args.idle_timeout, args.seed)
+    try:
+        asyncio.run(server.serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,23 @@
 import pygame
+import argparse
 import random
 import sys
 from pygame.locals import *
 
-# Initialize pygame
-pygame.init()
+from compositor import Compositor
+from font_cache import FontCache
+from game_engine import DIFFICULTY, GameEngine, add_difficulty
+from layout import Layout
+from profiler import FrameProfiler
+from replay import Recorder
+from stats_store import StatsStore
+from telemetry import FORMATS, TelemetryExporter
+from text_cache import TextCache
 
-# Get the screen information
-info = pygame.display.Info()
-WIDTH, HEIGHT = info.current_w, info.current_h  # Use full screen dimensions
+try:
+    import numpy
+except ImportError:  # pygame.surfarray needs numpy; fall back to plain draw calls
+    numpy = None
 
 # Constants
 WHITE = (255, 255, 255)
@@ -24,54 +33,213 @@ LIGHT_BLUE = (173, 216, 230)
 LIGHT_GREEN = (144, 238, 144)
 LIGHT_RED = (255, 182, 193)
 
-# Difficulty levels
-DIFFICULTY = {
-    "EASY": {"min": 1, "max": 50, "attempts": 10, "color": LIGHT_GREEN},
-    "MEDIUM": {"min": 1, "max": 100, "attempts": 15, "color": LIGHT_BLUE},
-    "HARD": {"min": 1, "max": 200, "attempts": 25, "color": LIGHT_RED}
+# Difficulty button colors; the rules themselves live in game_engine.DIFFICULTY
+DIFFICULTY_COLORS = {
+    "EASY": LIGHT_GREEN,
+    "MEDIUM": LIGHT_BLUE,
+    "HARD": LIGHT_RED,
+    "CUSTOM": GRAY
 }
 
+# History colors for each hot/cold band
+BAND_COLORS = {
+    "VERY_HOT": RED,
+    "HOT": YELLOW,
+    "WARM": YELLOW,
+    "COOL": BLUE,
+    "COLD": BLUE
+}
+
+FPS = 30
+MENU_COLORKEY = (255, 0, 255)  # Marks the menu layer's rounded-off corners; not used in the menu itself
+IDLE_TIMEOUT_MS = 1000  # Longest the idle loop sleeps before rechecking the view; it redraws only if that changed
+
+# Methods timed by the frame profiler, with the phase name each is reported under
+PROFILED_PHASES = {
+    "handle_events": "handle_events",
+    "draw_background": "background",
+    "paint_chrome": "paint_chrome",
+    "draw_leaderboard": "draw_leaderboard",
+    "draw_game": "draw_game",
+    "draw_hamburger_menu": "draw_hamburger_menu",
+    "present": "display.flip"
+}
+
+def build_gradient(width, height):
+    # Render the vertical background gradient into its own surface
+    if numpy is not None:
+        # Same per-row formula as the old draw loop, computed for every row at once
+        rows = (180 + (numpy.arange(height) / height) * 50).astype(numpy.uint8)
+        column = pygame.surfarray.make_surface(numpy.repeat(rows[numpy.newaxis, :, numpy.newaxis], 3, axis=2))
+        surface = pygame.transform.scale(column, (width, height))
+    else:
+        surface = pygame.Surface((width, height))
+        for y in range(height):
+            color_value = int(180 + (y / height) * 50)
+            pygame.draw.rect(surface, (color_value, color_value, color_value), (0, y, width, 1))
+    return surface.convert()
+
+
 class NumberGuessingGame:
-    def __init__(self):
-        # Create full screen surface
-        self.screen = pygame.display.set_mode((WIDTH, HEIGHT), pygame.FULLSCREEN)
+    def __init__(self, dirty_rects=False, seed=None, size=None, fullscreen=True, profiler=None, stats=None,
+                 render_scale=1.0, telemetry=None):
+        # Only the display and font modules are used; audio and joystick are never started
+        pygame.display.init()
+        pygame.font.init()
+        if size is None:
+            info = pygame.display.Info()
+            size = (info.current_w, info.current_h)  # Use full screen dimensions
+        
+        # Create full screen surface (or a resizable window of the given size)
+        flags = pygame.FULLSCREEN if fullscreen else pygame.RESIZABLE
+        self.display = pygame.display.set_mode(size, flags)
         pygame.display.set_caption("Number Guessing Game")
         
-        # Scale fonts based on screen size
-        font_scale = min(WIDTH, HEIGHT) / 1000  # Base scaling factor
-        self.title_font = pygame.font.SysFont("Arial", int(50 * font_scale), bold=True)
-        self.large_font = pygame.font.SysFont("Arial", int(36 * font_scale), bold=True)
-        self.medium_font = pygame.font.SysFont("Arial", int(28 * font_scale))
-        self.small_font = pygame.font.SysFont("Arial", int(24 * font_scale))
-        
-        self.state = "SELECT_DIFFICULTY"  # Game states: SELECT_DIFFICULTY, PLAYING, GAME_OVER
-        self.difficulty = None
+        # Below 1.0 every frame is drawn into a smaller offscreen surface (self.screen)
+        # and scaled up to the display in one call when it is presented
+        self.render_scale = render_scale
+        
+        # Font files found on an earlier start, so SysFont's font scan is skipped
+        self.font_cache = FontCache()
+        self.apply_size()
+        self.font_cache.save()
+        
+        # Every text draw goes through this cache so unchanged labels are not re-rasterized
+        self.text_cache = TextCache()
+        
+        # Game rules and round state; this class only draws it and feeds it input.
+        # A TelemetryExporter, if given, is fed every guess and round by the engine.
+        self.engine = GameEngine(seed=seed, telemetry=telemetry)
+        self.guess = ""  # Digits typed into the input box
         self.game_paused = False
         self.menu_open = False
+        self.show_leaderboard = False
+        
+        # Finished rounds are recorded here when a StatsStore is given
+        self.stats = stats
+        
+        # Input recorder (see replay.py); every event handle_events consumes is passed to it
+        self.recorder = None
+        self.background = None  # Cached gradient, rebuilt when the display size changes
+        
+        # Pooled layer surfaces: static chrome, the pause overlay and the open menu
+        self.compositor = Compositor()
+        
+        # Dirty-rectangle mode: only push the regions whose contents changed
+        self.dirty_rects = dirty_rects
+        self.drawn_screen_key = None
+        self.drawn_regions = {}
+        
+        # Optional frame profiler; without one the loop runs uninstrumented
+        self.profiler = None
+        if profiler is not None:
+            self.attach_profiler(profiler)
         self.reset_game()
         
+    def apply_size(self):
+        # Fonts and the layout table depend on the resolution, so rebuild them together
+        if self.render_scale == 1.0:
+            self.screen = self.display
+        else:
+            display_width, display_height = self.display.get_size()
+            size = (max(1, round(display_width * self.render_scale)), max(1, round(display_height * self.render_scale)))
+            self.screen = pygame.Surface(size, 0, self.display)
+        self.width, self.height = self.screen.get_size()
+        
+        # Scale fonts based on screen size
+        font_scale = min(self.width, self.height) / 1000  # Base scaling factor
+        self.title_font = self.font_cache.load("Arial", int(50 * font_scale), bold=True)
+        self.large_font = self.font_cache.load("Arial", int(36 * font_scale), bold=True)
+        self.medium_font = self.font_cache.load("Arial", int(28 * font_scale))
+        self.small_font = self.font_cache.load("Arial", int(24 * font_scale))
+        
+        self.layout = Layout(self.width, self.height, self.small_font.get_linesize(), self.medium_font.get_linesize())
+        
+    # Round state read straight from the engine
+    @property
+    def state(self):
+        return self.engine.game.state
+        
+    @property
+    def difficulty(self):
+        return self.engine.game.difficulty
+        
+    @property
+    def min_number(self):
+        return self.engine.game.min_number
+        
+    @property
+    def max_number(self):
+        return self.engine.game.max_number
+        
+    @property
+    def max_attempts(self):
+        return self.engine.game.max_attempts
+        
+    @property
+    def secret_number(self):
+        return self.engine.game.secret_number
+        
+    @property
+    def attempts(self):
+        return self.engine.game.attempts
+        
+    @property
+    def win(self):
+        return self.engine.game.win
+        
+    @property
+    def guess_history(self):
+        return self.engine.game.guess_history
+        
+    @property
+    def remaining_candidates(self):
+        return self.engine.game.candidates.remaining
+        
+    @property
+    def ruled_out(self):
+        return self.engine.game.ruled_out
+        
+    @property
+    def max_digits(self):
+        # Enough digits for the largest secret, and never fewer than the original 3
+        return max(3, len(str(self.max_number)))
+        
+    @property
+    def message(self):
+        return self.engine.message
+        
+    @message.setter
+    def message(self, message):
+        self.engine.set_message(message)
+        
     def reset_game(self):
-        self.attempts = 0
-        self.game_over = False
-        self.win = False
         self.guess = ""
-        
-        if self.difficulty:
-            diff = DIFFICULTY[self.difficulty]
-            self.min_number = diff["min"]
-            self.max_number = diff["max"]
-            self.max_attempts = diff["attempts"]
-            self.secret_number = random.randint(self.min_number, self.max_number)
-            self.message = f"Guess a number between {self.min_number} and {self.max_number}"
-        else:
-            self.message = "Select a difficulty level"
-            
-        self.guess_history = []
+        self.engine.reset_game()
         
     def select_difficulty(self, difficulty):
-        self.difficulty = difficulty
-        self.state = "PLAYING"
-        self.reset_game()
+        self.guess = ""
+        self.engine.select_difficulty(difficulty)
+        
+    def restart(self):
+        self.guess = ""
+        self.engine.restart()
+        
+    def back_to_menu(self):
+        self.guess = ""
+        self.engine.back_to_menu()
+        
+    def check_guess(self, guess):
+        result = self.engine.check_guess(guess)
+        if self.stats is not None and self.state == "GAME_OVER":
+            self.stats.record_round(self.engine.game)
+        return result
+        
+    def attach_profiler(self, profiler):
+        # Swap the phase methods for timed wrappers on this instance only
+        self.profiler = profiler
+        for method, phase in PROFILED_PHASES.items():
+            setattr(self, method, profiler.wrap(phase, getattr(self, method)))
         
     def toggle_menu(self):
         self.menu_open = not self.menu_open
@@ -79,14 +247,56 @@ class NumberGuessingGame:
     def toggle_pause(self):
         self.game_paused = not self.game_paused
         
-    def get_back_button_rect(self):
-        # Scale the back button based on screen size
-        btn_width = WIDTH * 0.1
-        btn_height = HEIGHT * 0.05
-        return pygame.Rect(WIDTH * 0.05, HEIGHT * 0.05, btn_width, btn_height)
+    def to_render_pos(self, pos):
+        # Map a display position (mouse events) onto the surface the game draws into
+        if self.screen is self.display:
+            return pos
+        display_width, display_height = self.display.get_size()
+        return (pos[0] * self.width // display_width, pos[1] * self.height // display_height)
+        
+    def to_display_rect(self, rect):
+        # The display area a rect on the render surface ends up covering once scaled
+        display_width, display_height = self.display.get_size()
+        left = rect.left * display_width // self.width
+        top = rect.top * display_height // self.height
+        right = -(-rect.right * display_width // self.width)
+        bottom = -(-rect.bottom * display_height // self.height)
+        return pygame.Rect(left, top, right - left, bottom - top).inflate(2, 2).clip(self.display.get_rect())
+        
+    def get_click_targets(self):
+        # Actions a click can trigger right now
+        targets = {"hamburger"}
+        if self.menu_open:
+            targets.update(("menu:resume", "menu:pause", "menu:quit"))
+        if self.state in ["PLAYING", "GAME_OVER"]:
+            targets.add("back")
+        if self.state == "SELECT_DIFFICULTY" and not self.show_leaderboard:
+            targets.update(f"difficulty:{difficulty}" for difficulty in DIFFICULTY)
+        return targets
+        
+    def click(self, action):
+        if action == "back":
+            self.back_to_menu()
+        elif action == "hamburger":
+            self.toggle_menu()
+        elif action == "menu:resume":
+            self.game_paused = False
+            self.menu_open = False
+        elif action == "menu:pause":
+            self.game_paused = True
+            self.menu_open = False
+        elif action == "menu:quit":
+            pygame.quit()
+            sys.exit()
+        elif action.startswith("difficulty:"):
+            self.select_difficulty(action.split(":", 1)[1])
     
-    def handle_events(self):
-        for event in pygame.event.get():
+    def handle_events(self, events=None):
+        if events is None:
+            events = pygame.event.get()
+        if self.recorder is not None:
+            self.recorder.record(events)
+        for event in events:
             if event.type == QUIT:
                 pygame.quit()
                 sys.exit()
@@ -96,46 +306,20 @@ class NumberGuessingGame:
                 pygame.quit()
                 sys.exit()
                 
-            if event.type == MOUSEBUTTONDOWN:
-                # Check if back button was clicked (when in PLAYING or GAME_OVER state)
-                if self.state in ["PLAYING", "GAME_OVER"]:
-                    back_button_rect = self.get_back_button_rect()
-                    if back_button_rect.collidepoint(event.pos):
-                        self.state = "SELECT_DIFFICULTY"
-                        self.difficulty = None
-                        self.reset_game()
+            # F3 shows or hides the frame profiler overlay
+            if event.type == KEYDOWN and event.key == K_F3 and self.profiler is not None:
+                self.profiler.toggle_overlay()
                 
-                # Check if hamburger button was clicked
-                hamburger_rect = pygame.Rect(WIDTH - WIDTH * 0.06, HEIGHT * 0.02, WIDTH * 0.04, HEIGHT * 0.05)
-                if hamburger_rect.collidepoint(event.pos):
-                    self.toggle_menu()
-                    
-                # Handle menu button clicks if menu is open
-                if self.menu_open:
-                    # Resume button
-                    resume_button = pygame.Rect(WIDTH - WIDTH * 0.17, HEIGHT * 0.07, WIDTH * 0.15, HEIGHT * 0.05)
-                    if resume_button.collidepoint(event.pos):
-                        self.game_paused = False
-                        self.menu_open = False
-                        
-                    # Pause button
-                    pause_button = pygame.Rect(WIDTH - WIDTH * 0.17, HEIGHT * 0.13, WIDTH * 0.15, HEIGHT * 0.05)
-                    if pause_button.collidepoint(event.pos):
-                        self.game_paused = True
-                        self.menu_open = False
-                        
-                    # Quit button
-                    quit_button = pygame.Rect(WIDTH - WIDTH * 0.17, HEIGHT * 0.19, WIDTH * 0.15, HEIGHT * 0.05)
-                    if quit_button.collidepoint(event.pos):
-                        pygame.quit()
-                        sys.exit()
+            # Windowed mode: rebuild fonts and layout for the new size
+            if event.type == VIDEORESIZE:
+                self.display = pygame.display.get_surface()
+                self.apply_size()
                 
-                if self.state == "SELECT_DIFFICULTY":
-                    # Check if any difficulty button was clicked
-                    for difficulty in ["EASY", "MEDIUM", "HARD"]:
-                        button_rect = self.get_difficulty_button_rect(difficulty)
-                        if button_rect.collidepoint(event.pos):
-                            self.select_difficulty(difficulty)
+            if event.type == MOUSEBUTTONDOWN:
+                # One lookup in the layout table decides what was clicked
+                action = self.layout.hit_test(self.to_render_pos(event.pos), self.get_click_targets())
+                if action is not None:
+                    self.click(action)
                     
             if not self.game_paused and self.state == "PLAYING":
                 if event.type == KEYDOWN:
@@ -148,287 +332,489 @@ class NumberGuessingGame:
                             self.message = "Please enter a valid number!"
                     elif event.key == K_BACKSPACE:
                         self.guess = self.guess[:-1]
-                    elif event.key in range(K_0, K_9 + 1) and len(self.guess) < 3:
+                    elif event.key in range(K_0, K_9 + 1) and len(self.guess) < self.max_digits:
                         self.guess += chr(event.key)
                         
             elif self.state == "GAME_OVER":
                 if event.type == KEYDOWN:
                     if event.key == K_r:
                         # Reset with same difficulty
-                        self.state = "PLAYING"
-                        self.reset_game()
+                        self.restart()
                     elif event.key == K_m:
                         # Return to difficulty selection
-                        self.state = "SELECT_DIFFICULTY"
-                        self.difficulty = None
-                        self.reset_game()
+                        self.back_to_menu()
+                        
+            elif self.state == "SELECT_DIFFICULTY":
+                if event.type == KEYDOWN and event.key == K_l and self.stats is not None:
+                    # Show or hide the leaderboard
+                    self.show_leaderboard = not self.show_leaderboard
                     
-    def check_guess(self, guess):
-        self.attempts += 1
-        
-        difference = abs(guess - self.secret_number)
-        
-        if guess == self.secret_number:
-            self.win = True
-            self.state = "GAME_OVER"
-            self.message = f"Congratulations! You guessed the number in {self.attempts} attempts!"
-        elif self.attempts >= self.max_attempts:
-            self.state = "GAME_OVER"
-            self.message = f"Game Over! The number was {self.secret_number}"
-        else:
-            # Determine how close the guess is
-            if difference <= self.max_number * 0.05:  # Within 5% of range
-                feedback = "Very hot! 🔥"
-                color = RED
-            elif difference <= self.max_number * 0.1:  # Within 10% of range
-                feedback = "Hot! 🔥"
-                color = YELLOW
-            elif difference <= self.max_number * 0.2:  # Within 20% of range
-                feedback = "Warm 😊"
-                color = YELLOW
-            elif difference <= self.max_number * 0.3:  # Within 30% of range
-                feedback = "Cool ❄️"
-                color = BLUE
-            else:
-                feedback = "Cold! ❄️❄️"
-                color = BLUE
-                
-            hint = "Higher 👆" if guess < self.secret_number else "Lower 👇"
-            self.message = f"{feedback} Try {hint}. Attempts: {self.attempts}/{self.max_attempts}"
-            
-            # Add to history
-            self.guess_history.append((guess, color))
-            
-    def get_difficulty_button_rect(self, difficulty):
-        # Scale buttons based on screen size
-        button_width = WIDTH * 0.3  # Make buttons wider
-        button_height = HEIGHT * 0.08
-        center_x = WIDTH // 2
-        
-        # Create more vertical space between buttons
-        if difficulty == "EASY":
-            return pygame.Rect(center_x - button_width/2, HEIGHT * 0.15, button_width, button_height)
-        elif difficulty == "MEDIUM":
-            return pygame.Rect(center_x - button_width/2, HEIGHT * 0.32, button_width, button_height)
-        elif difficulty == "HARD":
-            return pygame.Rect(center_x - button_width/2, HEIGHT * 0.49, button_width, button_height)
-        
-    def draw_difficulty_selection(self):
+    def draw_difficulty_selection(self, surface):
+        # Everything on this screen is static, so it is only ever painted into the chrome layer
         # Draw title
-        title = self.title_font.render("Number Guessing Game", True, PURPLE)
-        title_rect = title.get_rect(center=(WIDTH // 2, HEIGHT * 0.08))
-        self.screen.blit(title, title_rect)
+        title = self.text_cache.render(self.title_font, "Number Guessing Game", True, PURPLE)
+        title_rect = title.get_rect(center=(self.width // 2, self.height * 0.08))
+        surface.blit(title, title_rect)
         
         # Draw subtitle
-        subtitle = self.medium_font.render("Select Difficulty Level", True, BLACK)
-        subtitle_rect = subtitle.get_rect(center=(WIDTH // 2, HEIGHT * 0.12))
-        self.screen.blit(subtitle, subtitle_rect)
+        subtitle = self.text_cache.render(self.medium_font, "Select Difficulty Level", True, BLACK)
+        subtitle_rect = subtitle.get_rect(center=(self.width // 2, self.height * 0.12))
+        surface.blit(subtitle, subtitle_rect)
         
         # Draw difficulty buttons with plenty of space for details underneath
-        for difficulty in ["EASY", "MEDIUM", "HARD"]:
-            button_rect = self.get_difficulty_button_rect(difficulty)
+        for difficulty in DIFFICULTY:
+            button_rect = self.layout.difficulty_buttons[difficulty]
             diff_data = DIFFICULTY[difficulty]
             
             # Draw button
-            pygame.draw.rect(self.screen, diff_data["color"], button_rect, border_radius=15)
-            pygame.draw.rect(self.screen, BLACK, button_rect, 2, border_radius=15)
+            pygame.draw.rect(surface, DIFFICULTY_COLORS[difficulty], button_rect, border_radius=15)
+            pygame.draw.rect(surface, BLACK, button_rect, 2, border_radius=15)
             
             # Draw button text
-            button_text = self.large_font.render(difficulty, True, BLACK)
+            button_text = self.text_cache.render(self.large_font, difficulty, True, BLACK)
             button_text_rect = button_text.get_rect(center=button_rect.center)
-            self.screen.blit(button_text, button_text_rect)
+            surface.blit(button_text, button_text_rect)
             
             # Draw difficulty details - significantly below the button
-            details_text = self.medium_font.render(
+            details_text = self.text_cache.render(
+                self.medium_font,
                 f"Range: {diff_data['min']}-{diff_data['max']}, Attempts: {diff_data['attempts']}", 
                 True, BLACK
             )
             details_rect = details_text.get_rect(center=(button_rect.centerx, button_rect.bottom + button_rect.height * 0.6))
-            self.screen.blit(details_text, details_rect)
+            surface.blit(details_text, details_rect)
+        
+        # Point to the leaderboard when stats are being kept
+        if self.stats is not None:
+            hint = self.text_cache.render(self.small_font, "Press L for the leaderboard", True, DARK_GRAY)
+            surface.blit(hint, hint.get_rect(center=(self.width // 2, self.height * 0.92)))
+    
+    def draw_leaderboard(self):
+        title = self.text_cache.render(self.title_font, "Leaderboard", True, PURPLE)
+        self.screen.blit(title, title.get_rect(center=(self.width // 2, self.height * 0.08)))
+        
+        # One row per difficulty, read from the stats index
+        columns = (0.1, 0.3, 0.42, 0.56, 0.68, 0.82)
+        header = ("Difficulty", "Rounds", "Win rate", "Best", "Avg tries", "Best time")
+        rows = [(header, BLACK)]
+        for difficulty, stats in self.stats.leaderboard().items():
+            rows.append(((
+                difficulty,
+                str(stats["rounds"]),
+                f"{stats['win_rate']:.0%}",
+                str(stats["best_attempts"] or "-"),
+                f"{stats['mean_attempts']:.1f}" if stats["mean_attempts"] else "-",
+                f"{stats['best_seconds']:.1f}s" if stats["best_seconds"] is not None else "-"
+            ), DARK_GRAY))
+        if len(rows) == 1:
+            rows.append((("No rounds played yet",), DARK_GRAY))
+        
+        for row, (cells, color) in enumerate(rows):
+            y = self.height * (0.2 + row * 0.06)
+            for column, cell in enumerate(cells):
+                font = self.medium_font if row == 0 else self.small_font
+                text = self.text_cache.render(font, cell, True, color)
+                self.screen.blit(text, (self.width * columns[column], y))
+        
+        back_hint = self.text_cache.render(self.small_font, "Press L to go back", True, DARK_GRAY)
+        self.screen.blit(back_hint, back_hint.get_rect(center=(self.width // 2, self.height * 0.92)))
     
-    def draw_back_button(self):
-        back_button_rect = self.get_back_button_rect()
-        pygame.draw.rect(self.screen, LIGHT_BLUE, back_button_rect, border_radius=5)
-        pygame.draw.rect(self.screen, BLACK, back_button_rect, 2, border_radius=5)
+    def draw_back_button(self, surface):
+        back_button_rect = self.layout.back_button
+        pygame.draw.rect(surface, LIGHT_BLUE, back_button_rect, border_radius=5)
+        pygame.draw.rect(surface, BLACK, back_button_rect, 2, border_radius=5)
         
-        back_text = self.small_font.render("Back", True, BLACK)
+        back_text = self.text_cache.render(self.small_font, "Back", True, BLACK)
         back_text_rect = back_text.get_rect(center=back_button_rect.center)
-        self.screen.blit(back_text, back_text_rect)
+        surface.blit(back_text, back_text_rect)
             
-    def draw_hamburger_menu(self):
+    def draw_hamburger_button(self, surface):
         # Draw hamburger button
-        hamburger_rect = pygame.Rect(WIDTH - WIDTH * 0.06, HEIGHT * 0.02, WIDTH * 0.04, HEIGHT * 0.05)
-        pygame.draw.rect(self.screen, DARK_GRAY, hamburger_rect, border_radius=5)
+        pygame.draw.rect(surface, DARK_GRAY, self.layout.hamburger, border_radius=5)
         
         # Draw hamburger icon lines
-        line_height = HEIGHT * 0.004
-        for i in range(3):
-            line_rect = pygame.Rect(
-                WIDTH - WIDTH * 0.05, 
-                HEIGHT * 0.028 + i * HEIGHT * 0.012, 
-                WIDTH * 0.02, 
-                line_height
-            )
-            pygame.draw.rect(self.screen, WHITE, line_rect)
+        for line_rect in self.layout.hamburger_lines:
+            pygame.draw.rect(surface, WHITE, line_rect)
+            
+    def paint_menu(self, surface):
+        # The open menu, painted once into its layer; its origin is the menu region's top left
+        origin = self.layout.regions["menu"].topleft
+        surface.fill(MENU_COLORKEY)
+        surface.set_colorkey(MENU_COLORKEY)
+        
+        # Draw menu background
+        menu_bg = self.layout.menu_bg.move(-origin[0], -origin[1])
+        pygame.draw.rect(surface, WHITE, menu_bg, border_radius=10)
+        pygame.draw.rect(surface, BLACK, menu_bg, 2, border_radius=10)
+        
+        # Resume, pause and quit buttons
+        for name, label, color in (("resume", "Resume", LIGHT_GREEN), ("pause", "Pause", LIGHT_BLUE), ("quit", "Quit", LIGHT_RED)):
+            button = self.layout.menu_buttons[name].move(-origin[0], -origin[1])
+            pygame.draw.rect(surface, color, button, border_radius=5)
+            text = self.text_cache.render(self.small_font, label, True, BLACK)
+            surface.blit(text, text.get_rect(center=button.center))
             
+    def draw_hamburger_menu(self):
         # Draw menu if open
         if self.menu_open:
-            # Draw menu background
-            menu_bg = pygame.Rect(WIDTH - WIDTH * 0.17, HEIGHT * 0.065, WIDTH * 0.16, HEIGHT * 0.17)
-            pygame.draw.rect(self.screen, WHITE, menu_bg, border_radius=10)
-            pygame.draw.rect(self.screen, BLACK, menu_bg, 2, border_radius=10)
-            
-            # Resume button
-            resume_button = pygame.Rect(WIDTH - WIDTH * 0.16, HEIGHT * 0.07, WIDTH * 0.14, HEIGHT * 0.05)
-            pygame.draw.rect(self.screen, LIGHT_GREEN, resume_button, border_radius=5)
-            resume_text = self.small_font.render("Resume", True, BLACK)
-            resume_text_rect = resume_text.get_rect(center=resume_button.center)
-            self.screen.blit(resume_text, resume_text_rect)
-            
-            # Pause button
-            pause_button = pygame.Rect(WIDTH - WIDTH * 0.16, HEIGHT * 0.13, WIDTH * 0.14, HEIGHT * 0.05)
-            pygame.draw.rect(self.screen, LIGHT_BLUE, pause_button, border_radius=5)
-            pause_text = self.small_font.render("Pause", True, BLACK)
-            pause_text_rect = pause_text.get_rect(center=pause_button.center)
-            self.screen.blit(pause_text, pause_text_rect)
-            
-            # Quit button
-            quit_button = pygame.Rect(WIDTH - WIDTH * 0.16, HEIGHT * 0.19, WIDTH * 0.14, HEIGHT * 0.05)
-            pygame.draw.rect(self.screen, LIGHT_RED, quit_button, border_radius=5)
-            quit_text = self.small_font.render("Quit", True, BLACK)
-            quit_text_rect = quit_text.get_rect(center=quit_button.center)
-            self.screen.blit(quit_text, quit_text_rect)
+            region = self.layout.regions["menu"]
+            menu = self.compositor.layer("menu", None, region.size, self.paint_menu, like=self.screen)
+            self.screen.blit(menu, region)
         
-    def draw_game(self):
-        diff_color = DIFFICULTY[self.difficulty]["color"]
+    def draw_game_chrome(self, surface):
+        # The parts of the game screen that only change with the difficulty or pausing
+        diff_color = DIFFICULTY_COLORS[self.difficulty]
         
         # Draw back button
-        self.draw_back_button()
+        self.draw_back_button(surface)
         
         # Draw game title with difficulty
-        title = self.title_font.render(f"Number Guessing Game - {self.difficulty}", True, PURPLE)
-        title_rect = title.get_rect(center=(WIDTH // 2, HEIGHT * 0.05))
-        self.screen.blit(title, title_rect)
+        title = self.text_cache.render(self.title_font, f"Number Guessing Game - {self.difficulty}", True, PURPLE)
+        title_rect = title.get_rect(center=(self.width // 2, self.height * 0.05))
+        surface.blit(title, title_rect)
         
         # Scale game area based on screen size
-        game_area = pygame.Rect(
-            WIDTH * 0.05, HEIGHT * 0.12,
-            WIDTH * 0.9, HEIGHT * 0.85
-        )
+        game_area = self.layout.game_area
         
         # Draw game area
-        pygame.draw.rect(self.screen, WHITE, game_area, border_radius=15)
-        pygame.draw.rect(self.screen, DARK_GRAY, game_area, 3, border_radius=15)
+        pygame.draw.rect(surface, WHITE, game_area, border_radius=15)
+        pygame.draw.rect(surface, DARK_GRAY, game_area, 3, border_radius=15)
+        
+        if self.game_paused:
+            return
+        
+        # Draw input box
+        input_box = self.layout.input_box
+        pygame.draw.rect(surface, GRAY, input_box, border_radius=10)
+        pygame.draw.rect(surface, BLACK, input_box, 2, border_radius=10)
+        
+        # Draw guess history title
+        history_title = self.text_cache.render(self.medium_font, "Guess History:", True, BLACK)
+        history_title_rect = history_title.get_rect(topleft=(self.width * 0.1, self.height * 0.35))
+        surface.blit(history_title, history_title_rect)
+        
+        # Draw range reminder
+        range_text = self.text_cache.render(self.small_font, f"Range: {self.min_number} - {self.max_number}", True, DARK_GRAY)
+        range_rect = range_text.get_rect(topleft=(self.width * 0.7, self.height * 0.35))
+        surface.blit(range_text, range_rect)
+        
+        # Draw colored difficulty indicator
+        diff_indicator = self.layout.diff_indicator
+        pygame.draw.rect(surface, diff_color, diff_indicator, border_radius=5)
+        diff_text = self.text_cache.render(self.small_font, self.difficulty, True, BLACK)
+        diff_text_rect = diff_text.get_rect(center=diff_indicator.center)
+        surface.blit(diff_text, diff_text_rect)
+        
+    def paint_pause_overlay(self, surface):
+        surface.fill((0, 0, 0, 128))  # Semi-transparent black
+        
+    def draw_game(self):
+        # Text that changes during a round, drawn over the chrome layer every frame
+        game_area = self.layout.game_area
         
         # Draw message
-        message_surface = self.medium_font.render(self.message, True, BLUE)
-        message_rect = message_surface.get_rect(center=(WIDTH // 2, HEIGHT * 0.15))
+        message_surface = self.text_cache.render(self.medium_font, self.message, True, BLUE)
+        message_rect = message_surface.get_rect(center=(self.width // 2, self.height * 0.15))
         self.screen.blit(message_surface, message_rect)
 
         # If game is paused, show pause overlay
         if self.game_paused:
-            # Semi-transparent overlay
-            pause_overlay = pygame.Surface((game_area.width, game_area.height), pygame.SRCALPHA)
-            pause_overlay.fill((0, 0, 0, 128))  # Semi-transparent black
+            # Semi-transparent overlay, from the layer pool rather than a new surface each frame
+            pause_overlay = self.compositor.layer("pause_overlay", None, game_area.size, self.paint_pause_overlay,
+                                                  pygame.SRCALPHA)
             self.screen.blit(pause_overlay, (game_area.x, game_area.y))
             
             # Pause message
-            pause_text = self.large_font.render("GAME PAUSED", True, WHITE)
-            pause_rect = pause_text.get_rect(center=(WIDTH // 2, HEIGHT // 2))
+            pause_text = self.text_cache.render(self.large_font, "GAME PAUSED", True, WHITE)
+            pause_rect = pause_text.get_rect(center=(self.width // 2, self.height // 2))
             self.screen.blit(pause_text, pause_rect)
             
             # Instruction to resume
-            resume_text = self.medium_font.render("Click menu to resume", True, WHITE)
-            resume_rect = resume_text.get_rect(center=(WIDTH // 2, HEIGHT // 2 + HEIGHT * 0.05))
+            resume_text = self.text_cache.render(self.medium_font, "Click menu to resume", True, WHITE)
+            resume_rect = resume_text.get_rect(center=(self.width // 2, self.height // 2 + self.height * 0.05))
             self.screen.blit(resume_text, resume_rect)
         else:
-            # Draw input box
-            input_box = pygame.Rect(WIDTH // 2 - WIDTH * 0.1, HEIGHT * 0.2, WIDTH * 0.2, HEIGHT * 0.06)
-            pygame.draw.rect(self.screen, GRAY, input_box, border_radius=10)
-            pygame.draw.rect(self.screen, BLACK, input_box, 2, border_radius=10)
-            
             # Draw current guess
             if self.state == "PLAYING":
-                guess_surface = self.large_font.render(self.guess, True, BLACK)
-                guess_rect = guess_surface.get_rect(center=input_box.center)
+                guess_surface = self.text_cache.render(self.large_font, self.guess, True, BLACK)
+                guess_rect = guess_surface.get_rect(center=self.layout.input_box.center)
                 self.screen.blit(guess_surface, guess_rect)
                 
                 # Draw instructions
-                instructions = self.small_font.render("Press ENTER to submit your guess", True, DARK_GRAY)
-                instructions_rect = instructions.get_rect(center=(WIDTH // 2, HEIGHT * 0.28))
+                instructions = self.text_cache.render(self.small_font, "Press ENTER to submit your guess", True, DARK_GRAY)
+                instructions_rect = instructions.get_rect(center=(self.width // 2, self.height * 0.28))
                 self.screen.blit(instructions, instructions_rect)
             else:  # GAME_OVER state
                 # Game over message
                 if self.win:
-                    result_text = self.large_font.render("You Won!", True, GREEN)
+                    result_text = self.text_cache.render(self.large_font, "You Won!", True, GREEN)
                 else:
-                    result_text = self.large_font.render(f"Game Over! Number was {self.secret_number}", True, RED)
-                result_rect = result_text.get_rect(center=(WIDTH // 2, HEIGHT * 0.2))
+                    result_text = self.text_cache.render(self.large_font, f"Game Over! Number was {self.secret_number}", True, RED)
+                result_rect = result_text.get_rect(center=(self.width // 2, self.height * 0.2))
                 self.screen.blit(result_text, result_rect)
                 
                 # Restart instructions
-                restart_text = self.medium_font.render("Press R to play again", True, BLUE)
-                restart_rect = restart_text.get_rect(center=(WIDTH // 2, HEIGHT * 0.25))
+                restart_text = self.text_cache.render(self.medium_font, "Press R to play again", True, BLUE)
+                restart_rect = restart_text.get_rect(center=(self.width // 2, self.height * 0.25))
                 self.screen.blit(restart_text, restart_rect)
                 
                 # Menu instructions
-                menu_text = self.medium_font.render("Press M for main menu", True, BLUE)
-                menu_rect = menu_text.get_rect(center=(WIDTH // 2, HEIGHT * 0.3))
+                menu_text = self.text_cache.render(self.medium_font, "Press M for main menu", True, BLUE)
+                menu_rect = menu_text.get_rect(center=(self.width // 2, self.height * 0.3))
                 self.screen.blit(menu_text, menu_rect)
                 
-            # Draw guess history
-            history_title = self.medium_font.render("Guess History:", True, BLACK)
-            history_title_rect = history_title.get_rect(topleft=(WIDTH * 0.1, HEIGHT * 0.35))
-            self.screen.blit(history_title, history_title_rect)
-            
             # Display previous guesses - scale for full screen
-            for i, (guess, color) in enumerate(self.guess_history[-10:]):  # Show last 10 guesses
-                y_pos = HEIGHT * 0.4 + i * HEIGHT * 0.04
-                guess_text = self.small_font.render(f"Guess #{i+1}: {guess}", True, color)
-                self.screen.blit(guess_text, (WIDTH * 0.1, y_pos))
+            for i, (guess, band) in enumerate(self.guess_history[-10:]):  # Show last 10 guesses
+                y_pos = self.height * 0.4 + i * self.height * 0.04
+                guess_text = self.text_cache.render(self.small_font, f"Guess #{i+1}: {guess}", True, BAND_COLORS[band])
+                self.screen.blit(guess_text, (self.width * 0.1, y_pos))
                 
-            # Draw range reminder
-            range_text = self.small_font.render(f"Range: {self.min_number} - {self.max_number}", True, DARK_GRAY)
-            range_rect = range_text.get_rect(topleft=(WIDTH * 0.7, HEIGHT * 0.35))
-            self.screen.blit(range_text, range_rect)
-            
             # Draw attempts counter
-            attempts_text = self.small_font.render(f"Attempts: {self.attempts}/{self.max_attempts}", True, DARK_GRAY)
-            attempts_rect = attempts_text.get_rect(topleft=(WIDTH * 0.7, HEIGHT * 0.4))
+            attempts_text = self.text_cache.render(self.small_font, f"Attempts: {self.attempts}/{self.max_attempts}", True, DARK_GRAY)
+            attempts_rect = attempts_text.get_rect(topleft=(self.width * 0.7, self.height * 0.4))
             self.screen.blit(attempts_text, attempts_rect)
             
-            # Draw colored difficulty indicator
-            diff_indicator = pygame.Rect(WIDTH * 0.7, HEIGHT * 0.45, WIDTH * 0.2, HEIGHT * 0.05)
-            pygame.draw.rect(self.screen, diff_color, diff_indicator, border_radius=5)
-            diff_text = self.small_font.render(self.difficulty, True, BLACK)
-            diff_text_rect = diff_text.get_rect(center=diff_indicator.center)
-            self.screen.blit(diff_text, diff_text_rect)
+            # Draw how many secrets the hints still allow
+            candidates_text = self.text_cache.render(
+                self.small_font, f"Candidates left: {self.remaining_candidates}", True, DARK_GRAY
+            )
+            self.screen.blit(candidates_text, (self.width * 0.7, self.height * 0.53))
+            
+            # Flag a guess that earlier hints had already excluded
+            if self.ruled_out:
+                ruled_out_text = self.text_cache.render(self.small_font, "Already ruled out!", True, RED)
+                self.screen.blit(ruled_out_text, (self.width * 0.7, self.height * 0.57))
         
-    def draw(self):
-        # Background with gradient
-        for y in range(HEIGHT):
-            color_value = int(180 + (y / HEIGHT) * 50)
-            pygame.draw.rect(self.screen, (color_value, color_value, color_value), (0, y, WIDTH, 1))
+    def get_background(self):
+        size = self.screen.get_size()
+        if self.background is None or self.background.get_size() != size:
+            self.background = build_gradient(*size)
+        return self.background
         
+    def get_chrome_key(self):
+        # What the chrome layer shows; it is repainted only when this changes
+        if self.state == "SELECT_DIFFICULTY" and self.show_leaderboard:
+            return ("leaderboard",)
         if self.state == "SELECT_DIFFICULTY":
-            self.draw_difficulty_selection()
-        else:  # PLAYING or GAME_OVER states
+            rules = tuple((name, diff["min"], diff["max"], diff["attempts"]) for name, diff in DIFFICULTY.items())
+            return ("selection", rules, self.stats is not None)
+        return ("game", self.difficulty, self.min_number, self.max_number, self.game_paused)
+        
+    def paint_chrome(self, surface):
+        # Gradient plus everything static on the current screen
+        surface.blit(self.get_background(), (0, 0))
+        screen = self.get_chrome_key()[0]
+        if screen == "selection":
+            self.draw_difficulty_selection(surface)
+        elif screen == "game":
+            self.draw_game_chrome(surface)
+        self.draw_hamburger_button(surface)
+        
+    def draw_background(self):
+        # Background and static chrome come from one retained layer, blitted in one call
+        chrome = self.compositor.layer("chrome", self.get_chrome_key(), self.screen.get_size(), self.paint_chrome,
+                                       like=self.screen)
+        self.screen.blit(chrome, (0, 0))
+        
+    def get_profiler_overlay_rect(self):
+        # Sized for every known phase so hiding it always clears the whole panel
+        rows = len(self.profiler.phases) + 1
+        line_height = self.small_font.get_linesize()
+        return pygame.Rect(10, self.height - rows * line_height - 20, self.width * 0.4, rows * line_height + 10)
+        
+    def draw_profiler_overlay(self):
+        panel = self.get_profiler_overlay_rect()
+        pygame.draw.rect(self.screen, BLACK, panel)
+        
+        line_height = self.small_font.get_linesize()
+        column_width = panel.width * 0.15
+        for row, (name, *numbers) in enumerate(self.profiler.get_overlay_lines()):
+            y = panel.y + 5 + row * line_height
+            self.screen.blit(self.text_cache.render(self.small_font, name, True, WHITE), (panel.x + 10, y))
+            # Right-align the p50/p95/max columns
+            for column, number in enumerate(numbers):
+                number_text = self.text_cache.render(self.small_font, number, True, WHITE)
+                right = panel.right - 10 - (len(numbers) - 1 - column) * column_width
+                self.screen.blit(number_text, number_text.get_rect(topright=(right, y)))
+        
+    def render_frame(self):
+        # Layers in order: chrome (background and static parts), dynamic text, overlays
+        self.draw_background()
+        
+        if self.state == "SELECT_DIFFICULTY" and self.show_leaderboard:
+            self.draw_leaderboard()
+        elif self.state != "SELECT_DIFFICULTY":  # PLAYING or GAME_OVER states
             self.draw_game()
         
         # Always draw hamburger menu on top
         self.draw_hamburger_menu()
-            
-        # Update display
-        pygame.display.flip()
         
-    def run(self):
+        if self.profiler is not None and self.profiler.visible:
+            self.draw_profiler_overlay()
+        
+    def get_screen_key(self):
+        # Anything that changes most of the screen forces a full redraw
+        return (self.screen.get_size(), self.state, self.difficulty, self.game_paused,
+                self.win, self.secret_number, self.show_leaderboard)
+        
+    def get_dirty_regions(self):
+        # Regions that can change on their own, with the state each one shows
+        layout_regions = self.layout.regions
+        regions = {"menu": (layout_regions["menu"], self.menu_open)}
+        
+        if self.profiler is not None:
+            overlay_lines = self.profiler.get_overlay_lines() if self.profiler.visible else None
+            regions["profiler"] = (self.get_profiler_overlay_rect(), overlay_lines)
+        
+        if self.state != "SELECT_DIFFICULTY":
+            regions["message"] = (layout_regions["message"], self.message)
+            regions["input"] = (layout_regions["input"], self.guess)
+            regions["history"] = (layout_regions["history"], tuple(self.guess_history[-10:]))
+            regions["attempts"] = (layout_regions["attempts"], (self.attempts, self.max_attempts))
+            regions["candidates"] = (layout_regions["candidates"], (self.remaining_candidates, self.ruled_out))
+        return regions
+        
+    def get_changed_rects(self):
+        # Returns None when the whole screen must be pushed, otherwise the changed rects
+        screen_key = self.get_screen_key()
+        regions = self.get_dirty_regions()
+        full_redraw = screen_key != self.drawn_screen_key
+        
+        rects = []
+        if not full_redraw:
+            for name, (rect, key) in regions.items():
+                if self.drawn_regions.get(name) != key:
+                    # Pad by the widest border so outlines are never left half-drawn
+                    rects.append(rect.inflate(6, 6).clip(self.screen.get_rect()))
+        
+        self.drawn_screen_key = screen_key
+        self.drawn_regions = {name: key for name, (rect, key) in regions.items()}
+        return None if full_redraw else rects
+        
+    def present(self, rects=None):
+        # Push the frame to the display: everything, or only the given rects
+        if self.screen is not self.display:
+            # One scale-and-blit of the whole render surface, written straight into the display
+            pygame.transform.scale(self.screen, self.display.get_size(), self.display)
+            if rects is not None:
+                rects = [self.to_display_rect(rect) for rect in rects]
+        if rects is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(rects)
+        
+    def draw(self):
+        self.compositor.begin_frame()
+        if not self.dirty_rects:
+            self.render_frame()
+            self.present()
+            return
+        
+        rects = self.get_changed_rects()
+        if rects is None:
+            self.render_frame()
+            self.present()
+        elif rects:
+            # Redraw each changed region clipped, so layering matches a full redraw exactly
+            for rect in rects:
+                self.screen.set_clip(rect)
+                self.render_frame()
+            self.screen.set_clip(None)
+            self.present(rects)
+        
+    def get_view_key(self):
+        # Everything the screen shows; the idle loop redraws only when this changes
+        regions = self.get_dirty_regions()
+        return (self.get_screen_key(), tuple(key for rect, key in regions.values()))
+        
+    def run(self, idle=False):
         clock = pygame.time.Clock()
         
+        if not idle:
+            while True:
+                self.handle_events()
+                self.draw()
+                clock.tick(FPS)
+        
+        # Idle mode: sleep in event.wait until something happens, then redraw only on change
+        drawn_key = None
         while True:
-            self.handle_events()
-            self.draw()
-            clock.tick(30)
+            event = pygame.event.wait(IDLE_TIMEOUT_MS)
+            events = pygame.event.get()
+            if event.type != NOEVENT:
+                events.insert(0, event)
+            self.handle_events(events)
+            
+            if any(event.type in (VIDEOEXPOSE, WINDOWEXPOSED) for event in events):
+                # The window contents were lost, so the next draw must push everything
+                drawn_key = None
+                self.drawn_screen_key = None
+            
+            view_key = self.get_view_key()
+            if view_key != drawn_key:
+                self.draw()
+                drawn_key = view_key
+                # Still cap the redraw rate while events stream in
+                clock.tick(FPS)
 
 if __name__ == "__main__":
-    game = NumberGuessingGame()
-    game.run()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Number Guessing Game")
+    parser.add_argument("--dirty-rects", action="store_true",
+                        help="only update the screen regions that changed each frame")
+    parser.add_argument("--idle", action="store_true",
+                        help="sleep until input arrives instead of redrawing at a fixed rate")
+    parser.add_argument("--custom-max", type=int,
+                        help="add a CUSTOM difficulty with secrets from 1 to this number (up to 10^18)")
+    parser.add_argument("--custom-attempts", type=int, default=60,
+                        help="attempts allowed in the CUSTOM difficulty (up to 65535)")
+    parser.add_argument("--profile", nargs="?", const="frame_profile.json", metavar="PATH",
+                        help="time each frame phase (F3 toggles the overlay) and write the timings here on exit")
+    parser.add_argument("--no-stats", action="store_true",
+                        help="do not record finished rounds or show the leaderboard")
+    parser.add_argument("--render-scale", type=float, default=1.0, metavar="SCALE",
+                        help="draw at this fraction of the display resolution (e.g. 0.5) and scale up once per frame")
+    parser.add_argument("--telemetry", nargs="?", const="", metavar="PATH",
+                        help="export per-guess and per-round events from a background thread (default file per format)")
+    parser.add_argument("--telemetry-format", choices=FORMATS, default="jsonl",
+                        help="JSON lines (rotated) or Prometheus text exposition")
+    parser.add_argument("--record", metavar="PATH",
+                        help="record the session's input and seed for replay.py")
+    args = parser.parse_args()
+    
+    if args.custom_max is not None:
+        try:
+            add_difficulty("CUSTOM", 1, args.custom_max, args.custom_attempts)
+        except ValueError as error:
+            parser.error(f"--custom-max/--custom-attempts: {error}")
+    
+    profiler = FrameProfiler() if args.profile else None
+    stats = None
+    if not args.no_stats:
+        try:
+            stats = StatsStore()
+        except OSError as error:
+            # A read-only or missing home only costs the leaderboard
+            print(f"stats: cannot open the stats store: {error} (playing without the leaderboard)", file=sys.stderr)
+    telemetry = None
+    if args.telemetry is not None:
+        telemetry = TelemetryExporter(args.telemetry or None, args.telemetry_format)
+    # A recorded session needs a known seed so the replay draws the same secrets
+    seed = random.SystemRandom().getrandbits(63) if args.record else None
+    if not 0 < args.render_scale <= 1:
+        parser.error("--render-scale must be greater than 0 and at most 1")
+    game = NumberGuessingGame(dirty_rects=args.dirty_rects, seed=seed, profiler=profiler, stats=stats,
+                              render_scale=args.render_scale, telemetry=telemetry)
+    if args.record:
+        game.recorder = Recorder(args.record, seed, game.display.get_size(), DIFFICULTY, args.render_scale,
+                                 stats is not None)
+    try:
+        game.run(idle=args.idle)
+    finally:
+        if profiler is not None:
+            profiler.dump(args.profile)
+        if game.recorder is not None:
+            game.recorder.finish(game)
+        if telemetry is not None:
+            telemetry.close()
+        if stats is not None:
+            stats.close()
@@ -0,0 +1,74 @@
+import pygame
+
+# Vertical position of each difficulty button, as a fraction of the screen height
+DIFFICULTY_ROWS = {
+    "EASY": 0.15,
+    "MEDIUM": 0.32,
+    "HARD": 0.49,
+    "CUSTOM": 0.66
+}
+
+MENU_BUTTONS = {
+    "resume": 0.07,
+    "pause": 0.13,
+    "quit": 0.19
+}
+
+
+class Layout:
+    # Every fixed rectangle on screen for one resolution, computed once. Drawing
+    # and click handling both read from here, so what is drawn is what is clickable.
+    def __init__(self, width, height, small_line, medium_line):
+        self.size = (width, height)
+
+        self.back_button = pygame.Rect(width * 0.05, height * 0.05, width * 0.1, height * 0.05)
+
+        # Hamburger button, its three icon lines, and the menu it opens
+        self.hamburger = pygame.Rect(width - width * 0.06, height * 0.02, width * 0.04, height * 0.05)
+        self.hamburger_lines = [
+            pygame.Rect(width - width * 0.05, height * 0.028 + i * height * 0.012, width * 0.02, height * 0.004)
+            for i in range(3)
+        ]
+        self.menu_bg = pygame.Rect(width - width * 0.17, height * 0.065, width * 0.16, height * 0.17)
+        self.menu_buttons = {
+            name: pygame.Rect(width - width * 0.16, height * top, width * 0.14, height * 0.05)
+            for name, top in MENU_BUTTONS.items()
+        }
+
+        # Difficulty selection buttons
+        button_width = width * 0.3
+        button_height = height * 0.08
+        self.difficulty_buttons = {
+            name: pygame.Rect(width // 2 - button_width/2, height * top, button_width, button_height)
+            for name, top in DIFFICULTY_ROWS.items()
+        }
+
+        # Game screen
+        self.game_area = pygame.Rect(width * 0.05, height * 0.12, width * 0.9, height * 0.85)
+        self.input_box = pygame.Rect(width // 2 - width * 0.1, height * 0.2, width * 0.2, height * 0.06)
+        self.diff_indicator = pygame.Rect(width * 0.7, height * 0.45, width * 0.2, height * 0.05)
+
+        # Regions the dirty-rectangle renderer can update on their own
+        message = pygame.Rect(0, 0, width, medium_line)
+        message.center = (width // 2, height * 0.15)
+        self.regions = {
+            "menu": self.menu_bg.union(self.menu_buttons["quit"]),
+            "message": message,
+            "input": self.input_box,
+            "history": pygame.Rect(width * 0.1, height * 0.4, width * 0.5, 9 * height * 0.04 + small_line),
+            "attempts": pygame.Rect(width * 0.7, height * 0.4, width * 0.25, small_line),
+            "candidates": pygame.Rect(width * 0.7, height * 0.53, width * 0.3, height * 0.04 + small_line)
+        }
+
+        # Click targets in priority order; the menu is drawn on top of everything
+        self.targets = [(f"menu:{name}", rect) for name, rect in self.menu_buttons.items()]
+        self.targets.append(("hamburger", self.hamburger))
+        self.targets.append(("back", self.back_button))
+        self.targets += [(f"difficulty:{name}", rect) for name, rect in self.difficulty_buttons.items()]
+
+    def hit_test(self, pos, active):
+        # The first active target under pos, or None
+        for action, rect in self.targets:
+            if action in active and rect.collidepoint(pos):
+                return action
+        return None
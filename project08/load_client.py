@@ -0,0 +1,119 @@
+import argparse
+import asyncio
+import subprocess
+import sys
+import time
+
+# Drives game_server.py with many concurrent sessions that play by bisection and
+# reports per-guess latency and how much server CPU the run cost.
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+async def request(reader, writer, line):
+    writer.write(line.encode() + b"\n")
+    await writer.drain()
+    reply = await reader.readline()
+    if not reply:
+        raise ConnectionError("server closed the connection")
+    return reply.decode().split()
+
+
+async def play_session(host, port, games, difficulty, latencies):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for _ in range(games):
+            _, low, high, _ = await request(reader, writer, f"NEW {difficulty}")
+            low, high = int(low), int(high)
+            while True:
+                guess = (low + high) // 2
+                start = time.perf_counter()
+                reply = await request(reader, writer, f"GUESS {guess}")
+                latencies.append(time.perf_counter() - start)
+                if reply[0] != "HINT":
+                    break
+                if reply[2] == "HIGHER":
+                    low = guess + 1
+                else:
+                    high = guess - 1
+        await request(reader, writer, "QUIT")
+    finally:
+        writer.close()
+
+
+async def server_stats(host, port):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        reply = await request(reader, writer, "STATS")
+    finally:
+        writer.close()
+    return {key: float(value) for key, value in (field.split("=") for field in reply[1:])}
+
+
+async def run_load(host, port, sessions, games, difficulty, ramp):
+    latencies = []
+    before = await server_stats(host, port)
+    start = time.perf_counter()
+
+    tasks = []
+    for _ in range(sessions):
+        tasks.append(asyncio.create_task(play_session(host, port, games, difficulty, latencies)))
+        if ramp:
+            await asyncio.sleep(ramp)
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+
+    elapsed = time.perf_counter() - start
+    after = await server_stats(host, port)
+    failures = [result for result in results if isinstance(result, Exception)]
+    return latencies, elapsed, before, after, failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test game_server.py on localhost")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5050)
+    parser.add_argument("--sessions", type=int, default=1000, help="concurrent sessions")
+    parser.add_argument("--games", type=int, default=10, help="games played by each session")
+    parser.add_argument("--difficulty", default="HARD")
+    parser.add_argument("--ramp", type=float, default=0.0, help="seconds between opening sessions")
+    parser.add_argument("--spawn-server", action="store_true",
+                        help="start game_server.py on a free port for the duration of the run")
+    args = parser.parse_args()
+
+    server = None
+    port = args.port
+    if args.spawn_server:
+        server = subprocess.Popen([sys.executable, "game_server.py", "--host", args.host, "--port", "0"],
+                                  stdout=subprocess.PIPE, text=True, cwd=sys.path[0] or None)
+        port = int(server.stdout.readline().rsplit(":", 1)[1])
+
+    try:
+        latencies, elapsed, before, after, failures = asyncio.run(
+            run_load(args.host, port, args.sessions, args.games, args.difficulty, args.ramp)
+        )
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    latencies.sort()
+    server_cpu = after["cpu"] - before["cpu"]
+    print(f"sessions:          {args.sessions} ({len(failures)} failed, peak {int(after['peak'])} on the server)")
+    print(f"guesses:           {len(latencies)} in {elapsed:.2f}s ({len(latencies) / elapsed:.0f}/s)")
+    print(f"latency p50:       {percentile(latencies, 0.50) * 1000:.3f} ms")
+    print(f"latency p99:       {percentile(latencies, 0.99) * 1000:.3f} ms")
+    print(f"server CPU:        {server_cpu:.2f}s ({server_cpu / elapsed * 100:.0f}% of one core)")
+    if server_cpu:
+        print(f"guesses per core-second: {len(latencies) / server_cpu:.0f}")
+        print(f"sessions per core:       {args.sessions * elapsed / server_cpu:.0f} at this request rate")
+    if failures:
+        print(f"first failure: {failures[0]!r}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+import argparse
+import atexit
+import json
+import os
+import subprocess
+import sys
+import time
+
+# Run without a real window
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+
+def child(idle, seconds):
+    # Sit on the difficulty screen untouched and report the CPU time the loop used
+    import pygame
+    from guess_the_number_pygame import NumberGuessingGame
+
+    game = NumberGuessingGame()
+    start_cpu = time.process_time()
+    start_wall = time.perf_counter()
+
+    def report():
+        print(json.dumps({
+            "cpu_seconds": time.process_time() - start_cpu,
+            "wall_seconds": time.perf_counter() - start_wall,
+        }))
+
+    atexit.register(report)
+    # The game exits through its own QUIT handling once the timer fires
+    pygame.time.set_timer(pygame.QUIT, int(seconds * 1000), 1)
+    game.run(idle=idle)
+
+
+def measure(idle, seconds):
+    args = [sys.executable, __file__, "--child", "--seconds", str(seconds)]
+    if idle:
+        args.append("--idle")
+    output = subprocess.run(args, capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare idle CPU use of the fixed-rate and event-driven loops")
+    parser.add_argument("--seconds", type=float, default=10.0, help="how long to leave each loop idle")
+    parser.add_argument("--idle", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.idle, args.seconds)
+        return
+
+    for name, idle in (("fixed 30 FPS", False), ("event-driven", True)):
+        result = measure(idle, args.seconds)
+        share = result["cpu_seconds"] / result["wall_seconds"] * 100
+        print(f"{name:>14}: {result['cpu_seconds']:.3f}s CPU over {result['wall_seconds']:.1f}s ({share:.1f}% of one core)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# Run without a real window
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+
+def child():
+    # Import, build the game and present its first frame, timing each step
+    start = time.perf_counter()
+    from guess_the_number_pygame import NumberGuessingGame
+    imported = time.perf_counter()
+    game = NumberGuessingGame()
+    constructed = time.perf_counter()
+    game.draw()
+    drawn = time.perf_counter()
+    print(json.dumps({
+        "first_frame_at": time.time(),
+        "import_ms": (imported - start) * 1000,
+        "construct_ms": (constructed - imported) * 1000,
+        "draw_ms": (drawn - constructed) * 1000,
+    }))
+
+
+def measure(cold):
+    # Time-to-first-frame from process launch, so interpreter start-up is included
+    if cold:
+        from font_cache import FONT_CACHE
+        if os.path.exists(FONT_CACHE):
+            os.remove(FONT_CACHE)
+    launched = time.time()
+    output = subprocess.run([sys.executable, __file__, "--child"], capture_output=True, text=True, check=True).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    result["first_frame_ms"] = (result.pop("first_frame_at") - launched) * 1000
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure time-to-first-frame of a fresh game process")
+    parser.add_argument("--runs", type=int, default=10, help="launches to take the median over")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child()
+        return
+
+    for name, cold in (("cold font cache", True), ("warm font cache", False)):
+        results = [measure(cold) for _ in range(args.runs)]
+        medians = {key: statistics.median(result[key] for result in results) for key in results[0]}
+        print(f"{name:>15}: first frame {medians['first_frame_ms']:7.1f} ms "
+              f"(import {medians['import_ms']:.1f}, construct {medians['construct_ms']:.1f}, draw {medians['draw_ms']:.1f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+import json
+import time
+from array import array
+
+OVERLAY_REFRESH = 0.5  # Seconds between recomputing the overlay percentiles
+
+
+class RingBuffer:
+    # Fixed-size store of the most recent timings, allocated once up front
+    def __init__(self, size):
+        self.samples = array("d", bytes(8 * size))
+        self.index = 0
+        self.count = 0
+
+    def append(self, value):
+        self.samples[self.index] = value
+        self.index = (self.index + 1) % len(self.samples)
+        self.count = min(self.count + 1, len(self.samples))
+
+    def values(self):
+        # Oldest first
+        if self.count < len(self.samples):
+            return self.samples[:self.count].tolist()
+        return (self.samples[self.index:] + self.samples[:self.index]).tolist()
+
+
+class FrameProfiler:
+    # Per-phase frame timings in milliseconds. Phases are timed by wrapping the
+    # methods that implement them, so nothing is measured (or paid for) unless
+    # a profiler has been attached to the game.
+    def __init__(self, size=600):
+        self.size = size
+        self.phases = {}
+        self.visible = False
+        self.overlay_lines = ()
+        self.overlay_updated = 0.0
+
+    def wrap(self, name, function):
+        buffer = self.phases.setdefault(name, RingBuffer(self.size))
+        clock = time.perf_counter
+
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                buffer.append((clock() - start) * 1000)
+
+        return timed
+
+    def summary(self):
+        stats = {}
+        for name, buffer in self.phases.items():
+            values = sorted(buffer.values())
+            if not values:
+                continue
+            stats[name] = {
+                "p50_ms": values[len(values) // 2],
+                "p95_ms": values[min(len(values) - 1, int(len(values) * 0.95))],
+                "max_ms": values[-1],
+                "samples": len(values),
+            }
+        return stats
+
+    def get_overlay_lines(self):
+        # Table rows for the overlay, refreshed a couple of times a second so it stays readable
+        now = time.monotonic()
+        if now - self.overlay_updated >= OVERLAY_REFRESH:
+            self.overlay_updated = now
+            lines = [("phase (ms)", "p50", "p95", "max")]
+            for name, stats in self.summary().items():
+                lines.append((name, f"{stats['p50_ms']:.2f}", f"{stats['p95_ms']:.2f}", f"{stats['max_ms']:.2f}"))
+            self.overlay_lines = tuple(lines)
+        return self.overlay_lines
+
+    def toggle_overlay(self):
+        self.visible = not self.visible
+        self.overlay_updated = 0.0
+
+    def dump(self, path):
+        with open(path, "w") as f:
+            json.dump({
+                "summary": self.summary(),
+                "samples_ms": {name: buffer.values() for name, buffer in self.phases.items()},
+            }, f, indent=2)
@@ -0,0 +1,183 @@
+import argparse
+import json
+import os
+import struct
+import sys
+import tempfile
+import time
+
+# Recording format:
+#   header   <8s magic><I length><JSON: seed, size, render scale, stats enabled, difficulty table>
+#   events   <I ms since start><B kind> then, by kind:
+#            KEYDOWN <I key> | MOUSEBUTTONDOWN <H x><H y><B button> | QUIT nothing
+#   footer   <I ms><B END><I length><JSON: final state, attempts, guess_history, message>
+
+MAGIC = b"NGGREC1\x00"
+LENGTH = struct.Struct("<I")
+EVENT_HEAD = struct.Struct("<IB")
+KEY = struct.Struct("<I")
+CLICK = struct.Struct("<HHB")
+
+QUIT_EVENT, KEY_EVENT, CLICK_EVENT, END = 0, 1, 2, 255
+
+
+def snapshot(game):
+    # The parts of the game a replay must reproduce exactly
+    return {
+        "state": game.state,
+        "attempts": game.attempts,
+        "guess_history": [[guess, band] for guess, band in game.guess_history],
+        "message": game.message,
+    }
+
+
+class Recorder:
+    # Captures the input events handle_events consumes, plus everything needed
+    # to rebuild the same game: the RNG seed, the screen size, the rules and whether
+    # the leaderboard was available (it changes what L and clicks do).
+    def __init__(self, path, seed, size, difficulty, render_scale=1.0, stats=False):
+        self.file = open(path, "wb")
+        self.start = time.monotonic()
+        header = json.dumps({"seed": seed, "size": list(size), "render_scale": render_scale,
+                             "stats": stats, "difficulty": difficulty}).encode()
+        self.file.write(MAGIC + LENGTH.pack(len(header)) + header)
+
+    def elapsed_ms(self):
+        return int((time.monotonic() - self.start) * 1000)
+
+    def record(self, events):
+        # Only the event types that can change the game are kept
+        import pygame
+
+        for event in events:
+            if event.type == pygame.KEYDOWN:
+                self.file.write(EVENT_HEAD.pack(self.elapsed_ms(), KEY_EVENT) + KEY.pack(event.key))
+            elif event.type == pygame.MOUSEBUTTONDOWN:
+                x, y = event.pos
+                self.file.write(EVENT_HEAD.pack(self.elapsed_ms(), CLICK_EVENT) + CLICK.pack(x, y, event.button))
+            elif event.type == pygame.QUIT:
+                self.file.write(EVENT_HEAD.pack(self.elapsed_ms(), QUIT_EVENT))
+
+    def finish(self, game):
+        footer = json.dumps(snapshot(game)).encode()
+        self.file.write(EVENT_HEAD.pack(self.elapsed_ms(), END) + LENGTH.pack(len(footer)) + footer)
+        self.file.close()
+
+
+def read_recording(path):
+    # Returns (header, [(ms, kind, data)], expected final snapshot or None)
+    with open(path, "rb") as f:
+        data = f.read()
+    if data[:len(MAGIC)] != MAGIC:
+        raise ValueError(f"{path} is not a game recording")
+    position = len(MAGIC)
+    length = LENGTH.unpack_from(data, position)[0]
+    position += LENGTH.size
+    header = json.loads(data[position:position + length])
+    position += length
+
+    events = []
+    expected = None
+    while position + EVENT_HEAD.size <= len(data):
+        ms, kind = EVENT_HEAD.unpack_from(data, position)
+        position += EVENT_HEAD.size
+        if kind == KEY_EVENT:
+            events.append((ms, kind, KEY.unpack_from(data, position)))
+            position += KEY.size
+        elif kind == CLICK_EVENT:
+            events.append((ms, kind, CLICK.unpack_from(data, position)))
+            position += CLICK.size
+        elif kind == QUIT_EVENT:
+            events.append((ms, kind, ()))
+        elif kind == END:
+            length = LENGTH.unpack_from(data, position)[0]
+            position += LENGTH.size
+            expected = json.loads(data[position:position + length])
+            break
+        else:
+            raise ValueError(f"{path}: unknown event kind {kind}")
+    return header, events, expected
+
+
+def replay_file(path, draw=False):
+    # Feed a recording back as fast as possible. Returns (matches, expected, actual, seconds).
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import pygame
+    from game_engine import DIFFICULTY
+    from guess_the_number_pygame import NumberGuessingGame
+    from stats_store import StatsStore
+
+    header, events, expected = read_recording(path)
+
+    # Play by exactly the recorded rules, and leave them as they were for the next file
+    saved_rules = dict(DIFFICULTY)
+    DIFFICULTY.clear()
+    DIFFICULTY.update(header["difficulty"])
+    stats = None
+    with tempfile.TemporaryDirectory() as directory:
+        try:
+            if header.get("stats"):
+                # A throwaway store, so L toggles the leaderboard as it did when recording
+                stats = StatsStore(directory)
+            game = NumberGuessingGame(seed=header["seed"], size=tuple(header["size"]), fullscreen=False,
+                                      render_scale=header.get("render_scale", 1.0), stats=stats)
+            start = time.perf_counter()
+            try:
+                for ms, kind, data in events:
+                    if kind == KEY_EVENT:
+                        event = pygame.event.Event(pygame.KEYDOWN, key=data[0], mod=0, unicode="")
+                    elif kind == CLICK_EVENT:
+                        event = pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=data[:2], button=data[2])
+                    else:
+                        event = pygame.event.Event(pygame.QUIT)
+                    game.handle_events([event])
+                    if draw:
+                        game.draw()
+            except SystemExit:
+                pass  # The recording ended with the player quitting
+            elapsed = time.perf_counter() - start
+            actual = snapshot(game)
+        finally:
+            if stats is not None:
+                stats.close()
+            DIFFICULTY.clear()
+            DIFFICULTY.update(saved_rules)
+
+    return expected is not None and actual == expected, expected, actual, elapsed
+
+
+def find_recordings(paths):
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if name.endswith(".rec"):
+                    yield os.path.join(path, name)
+        else:
+            yield path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay game recordings headless and check their final state")
+    parser.add_argument("paths", nargs="+", help="recording files or directories of .rec files")
+    parser.add_argument("--draw", action="store_true", help="also render every event (slower)")
+    args = parser.parse_args()
+
+    failures = 0
+    for path in find_recordings(args.paths):
+        try:
+            matches, expected, actual, elapsed = replay_file(path, args.draw)
+        except (OSError, ValueError, struct.error) as error:
+            # A missing or corrupt file fails on its own; the rest of the corpus still runs
+            print(f"FAIL {path} ({error})")
+            failures += 1
+            continue
+        print(f"{'PASS' if matches else 'FAIL'} {path} ({elapsed * 1000:.2f} ms)")
+        if not matches:
+            failures += 1
+            print(f"  expected: {expected}")
+            print(f"  actual:   {actual}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from game_engine import (BANDS, DIFFICULTY, FeasibilityTracker, GameEngine, LOSE, PLAYING, WIN, add_difficulty,
+                         band_distances, classify)
+
+CHUNK_SIZE = 1_000_000  # Games per batch handed to one worker
+UNBOUNDED = np.iinfo(np.int64).max // 4  # Stands in for "no limit" without overflowing int64 sums
+CHECK_LIMIT = 10_000  # Largest range --check walks secret by secret
+
+
+# Guessing strategies. Each one picks the next guess for every game still being
+# played, given the bounds that the feedback so far allows (lo/hi inclusive).
+def bisect_guess(lo, hi, rng):
+    return (lo + hi) // 2
+
+
+def random_guess(lo, hi, rng):
+    return rng.integers(lo, hi + 1)
+
+
+# name -> (choose function, whether it also narrows on the hot/cold band)
+STRATEGIES = {
+    "bisect": (bisect_guess, False),
+    "random": (random_guess, False),
+    "hotcold": (bisect_guess, True),
+}
+
+
+def register_strategy(name, choose, use_bands=False):
+    # Register before starting a process pool so forked workers see it too
+    STRATEGIES[name] = (choose, use_bands)
+
+
+def band_arrays(max_number):
+    # GameEngine's band distance limits as int64 arrays indexed like BANDS. They are
+    # exact integers, so comparing distances against them stays exact up to 10^18.
+    near, far = band_distances(max_number)
+    d_min = np.array([near[band] for band in BANDS], dtype=np.int64)
+    d_max = np.array([min(far[band], UNBOUNDED) for band in BANDS], dtype=np.int64)
+    return d_min, d_max
+
+
+def play_batch(difficulty, games, strategy, rng, secret=None):
+    # Play `games` rounds side by side. Returns the attempt each game was won on,
+    # with 0 for games that ran out of attempts.
+    rules = DIFFICULTY[difficulty]
+    min_number, max_number, max_attempts = rules["min"], rules["max"], rules["attempts"]
+    choose, use_bands = STRATEGIES[strategy]
+    d_min, d_max = band_arrays(max_number)
+
+    if secret is None:
+        secret = rng.integers(min_number, max_number + 1, size=games)
+    lo = np.full(games, min_number, dtype=np.int64)
+    hi = np.full(games, max_number, dtype=np.int64)
+    won_on = np.zeros(games, dtype=np.int32)  # Attempt limits go up to 65535
+    playing = np.arange(games)
+
+    for attempt in range(1, max_attempts + 1):
+        if playing.size == 0:
+            break
+        guess = choose(lo[playing], hi[playing], rng)
+        target = secret[playing]
+
+        # A correct guess wins even on the last attempt
+        hit = guess == target
+        won_on[playing[hit]] = attempt
+        if attempt == max_attempts:
+            break
+
+        miss = ~hit
+        playing, guess, target = playing[miss], guess[miss], target[miss]
+        higher = guess < target
+
+        if use_bands:
+            # Same as classify(): the first band whose largest distance covers this one
+            band = np.searchsorted(d_max[:-1], np.abs(guess - target), side="left")
+            near, far = d_min[band], d_max[band]
+        else:
+            near, far = 1, UNBOUNDED
+        lo[playing] = np.where(higher, np.maximum(lo[playing], guess + near), np.maximum(lo[playing], guess - far))
+        hi[playing] = np.where(higher, np.minimum(hi[playing], guess + far), np.minimum(hi[playing], guess - near))
+
+    return won_on
+
+
+def run_chunk(args):
+    difficulty, games, strategy, seed_sequence = args
+    won_on = play_batch(difficulty, games, strategy, np.random.default_rng(seed_sequence))
+    return np.bincount(won_on, minlength=DIFFICULTY[difficulty]["attempts"] + 1)
+
+
+def simulate(difficulty, games, strategy="bisect", seed=None, workers=None, chunk_size=CHUNK_SIZE):
+    # Play `games` rounds and summarise them. Large runs are split into chunks and
+    # spread across a process pool; workers=1 keeps everything in this process.
+    chunks = [chunk_size] * (games // chunk_size)
+    if games % chunk_size:
+        chunks.append(games % chunk_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(chunks))
+    tasks = [(difficulty, size, strategy, seed_sequence) for size, seed_sequence in zip(chunks, seeds)]
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(tasks) == 1:
+        counts = [run_chunk(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+            counts = list(pool.map(run_chunk, tasks))
+
+    histogram = np.sum(counts, axis=0)
+    return summarize(difficulty, strategy, histogram)
+
+
+def summarize(difficulty, strategy, histogram):
+    # histogram[0] counts losses, histogram[n] wins on attempt n
+    games = int(histogram.sum())
+    wins = games - int(histogram[0])
+    attempts = np.arange(len(histogram))
+    mean_attempts = float((histogram * attempts).sum() / wins) if wins else None
+    return {
+        "difficulty": difficulty,
+        "strategy": strategy,
+        "games": games,
+        "wins": wins,
+        "win_rate": wins / games if games else 0.0,
+        "mean_attempts_to_win": mean_attempts,
+        "attempt_distribution": {str(n): int(count) for n, count in enumerate(histogram) if n and count},
+        "losses": int(histogram[0]),
+    }
+
+
+def cross_check(difficulty, strategy):
+    # Play every possible secret through both the batch simulator and GameEngine
+    # and confirm they agree on every outcome. Only meaningful for deterministic
+    # strategies.
+    rules = DIFFICULTY[difficulty]
+    secrets = np.arange(rules["min"], rules["max"] + 1, dtype=np.int64)
+    batch = play_batch(difficulty, secrets.size, strategy, np.random.default_rng(0), secret=secrets)
+
+    choose, use_bands = STRATEGIES[strategy]
+    d_min, d_max = band_arrays(rules["max"])
+    engine = GameEngine()
+    for secret, batch_won_on in zip(secrets.tolist(), batch.tolist()):
+        engine.select_difficulty(difficulty)
+        engine.game.secret_number = secret
+        lo, hi = rules["min"], rules["max"]
+        won_on = 0
+        while engine.game.state == PLAYING:
+            guess = int(choose(np.array([lo]), np.array([hi]), None)[0])
+            result = engine.check_guess(guess)
+            if result == WIN:
+                won_on = engine.game.attempts
+            elif result != LOSE:
+                band = BANDS.index(result) if use_bands else 0
+                near, far = (d_min[band], d_max[band]) if use_bands else (1, hi - lo + 1)
+                if guess < secret:
+                    lo, hi = max(lo, guess + near), min(hi, guess + far)
+                else:
+                    lo, hi = max(lo, guess - far), min(hi, guess - near)
+        if won_on != batch_won_on:
+            raise AssertionError(
+                f"{difficulty}/{strategy}: secret {secret} won on {batch_won_on} in the simulator, {won_on} in GameEngine"
+            )
+    return secrets.size
+
+
+def tracker_check(difficulty, margin=5, guess_count=150):
+    # Compare FeasibilityTracker with a brute-force candidate set for every secret,
+    # over a fixed run of about guess_count guesses that also strays outside the range.
+    rules = DIFFICULTY[difficulty]
+    min_number, max_number = rules["min"], rules["max"]
+    step = max(7, (max_number - min_number) // guess_count)
+    guesses = list(range(min_number - margin, max_number + margin + 1, step))
+    # classify() for every distance that can occur, so the brute force filters whole arrays
+    band_of = np.array([BANDS.index(classify(distance, max_number))
+                        for distance in range(max_number - min_number + margin + 1)])
+    everything = np.arange(min_number, max_number + 1, dtype=np.int64)
+    for secret in range(min_number, max_number + 1):
+        tracker = FeasibilityTracker(min_number, max_number)
+        candidates = everything
+        for guess in guesses:
+            if guess == secret:
+                continue
+            if tracker.is_possible(guess) != bool((candidates == guess).any()):
+                raise AssertionError(f"{difficulty}: secret {secret}, guess {guess}: is_possible disagrees")
+            band = classify(abs(guess - secret), max_number)
+            higher = guess < secret
+            tracker.update(guess, band, higher)
+            candidates = candidates[
+                ((candidates > guess) == higher) & (candidates != guess)
+                & (band_of[np.abs(candidates - guess)] == BANDS.index(band))
+            ]
+            low, high = int(candidates.min()), int(candidates.max())
+            if (tracker.low, tracker.high) != (low, high) or tracker.remaining != candidates.size:
+                raise AssertionError(
+                    f"{difficulty}: secret {secret} after guess {guess}: tracker "
+                    f"{tracker.low}..{tracker.high}, brute force {low}..{high} ({candidates.size})"
+                )
+    return max_number - min_number + 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate many games per difficulty to balance ranges and attempt limits")
+    parser.add_argument("--games", type=int, default=1_000_000, help="games per difficulty and strategy")
+    parser.add_argument("--strategy", choices=sorted(STRATEGIES) + ["all"], default="all")
+    parser.add_argument("--difficulty", choices=sorted(DIFFICULTY) + ["CUSTOM", "all"], default="all")
+    parser.add_argument("--custom-max", type=int,
+                        help="add a CUSTOM difficulty with secrets from 1 to this number (up to 10^18)")
+    parser.add_argument("--custom-attempts", type=int, default=60,
+                        help="attempts allowed in the CUSTOM difficulty")
+    parser.add_argument("--workers", type=int, default=None, help="processes to use (default: all cores)")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--check", action="store_true",
+                        help="first verify the simulator and the candidate tracker against GameEngine for every secret")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    # Added before any process pool starts, so forked workers see it too
+    if args.custom_max is not None:
+        try:
+            add_difficulty("CUSTOM", 1, args.custom_max, args.custom_attempts)
+        except ValueError as error:
+            parser.error(f"--custom-max/--custom-attempts: {error}")
+    elif args.difficulty == "CUSTOM":
+        parser.error("--difficulty CUSTOM needs --custom-max")
+
+    difficulties = list(DIFFICULTY) if args.difficulty == "all" else [args.difficulty]
+    strategies = list(STRATEGIES) if args.strategy == "all" else [args.strategy]
+
+    if args.check:
+        for difficulty in difficulties:
+            rules = DIFFICULTY[difficulty]
+            if rules["max"] - rules["min"] + 1 > CHECK_LIMIT:
+                print(f"skipped checking {difficulty}: more than {CHECK_LIMIT} secrets to walk")
+                continue
+            for strategy in strategies:
+                if strategy != "random":
+                    print(f"checked {difficulty}/{strategy}: {cross_check(difficulty, strategy)} secrets agree")
+            print(f"checked {difficulty}/tracker: {tracker_check(difficulty)} secrets match brute force")
+
+    results = []
+    print(f"{'difficulty':>10} {'strategy':>8} {'games':>12} {'win rate':>9} {'mean tries':>10} {'games/s':>12}")
+    for difficulty in difficulties:
+        for strategy in strategies:
+            start = time.perf_counter()
+            result = simulate(difficulty, args.games, strategy, args.seed, args.workers)
+            elapsed = time.perf_counter() - start
+            results.append(result)
+            mean = result["mean_attempts_to_win"]
+            print(f"{difficulty:>10} {strategy:>8} {result['games']:>12} {result['win_rate']:9.4f} "
+                  f"{mean if mean is None else round(mean, 3):>10} {result['games'] / elapsed:12.0f}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+import mmap
+import os
+import struct
+import sys
+import time
+
+# Finished rounds are appended to a binary log. A fixed-size index file, memory
+# mapped, holds per-difficulty aggregates and how far into the log they reach,
+# so opening the store never reads the log unless the index is behind it.
+#
+# Log record:  <I length><B win><H attempts><d duration><d finished_at>
+#              <B name length><name><H guess count><Q guess>...
+#              name is the difficulty, plus its range for custom ones (round_name)
+# Index file:  header <8s magic><I version><I slots><Q log bytes indexed>
+#              then `slots` entries of <16s name><Q rounds><Q wins>
+#              <Q attempts over wins><d seconds over wins><I best attempts><d best seconds>
+
+DATA_DIR = os.path.join(os.path.expanduser("~"), ".number_guessing_game")
+
+LOG_NAME = "rounds.log"
+INDEX_NAME = "rounds.idx"
+INDEX_MAGIC = b"NGGIDX\x00\x00"
+INDEX_VERSION = 1
+INDEX_SLOTS = 32  # Difficulties the index can hold
+INDEX_NAME_BYTES = 16
+BUILT_IN = ("EASY", "MEDIUM", "HARD")  # Fixed ranges; anything else is keyed by its range too
+
+LENGTH = struct.Struct("<I")
+RECORD_HEAD = struct.Struct("<BHdd")
+NAME_LENGTH = struct.Struct("<B")
+GUESS_COUNT = struct.Struct("<H")
+GUESS = struct.Struct("<Q")
+INDEX_HEADER = struct.Struct("<8sIIQ")
+INDEX_ENTRY = struct.Struct("<16sQQQdId")
+
+
+def round_name(game):
+    # Custom ranges are ranked apart from each other, e.g. CUSTOM:1000 or CUSTOM:1e18
+    if game.difficulty in BUILT_IN:
+        return game.difficulty
+    text = str(game.max_number)
+    digits = text.rstrip("0")
+    zeros = len(text) - len(digits)
+    scale = f"{digits}e{zeros}" if zeros > 2 else text
+    if game.min_number != 1:
+        scale = f"{game.min_number}-{scale}"
+    return f"{game.difficulty}:{scale}"
+
+
+class StatsStore:
+    def __init__(self, directory=DATA_DIR):
+        os.makedirs(directory, exist_ok=True)
+        self.log_path = os.path.join(directory, LOG_NAME)
+        self.index_path = os.path.join(directory, INDEX_NAME)
+        self.index = self.open_index()
+        self.slots = self.read_slots()
+
+        # Catch up if the process died between a log append and its index update
+        log_size = os.path.getsize(self.log_path) if os.path.exists(self.log_path) else 0
+        indexed = self.indexed_bytes()
+        if indexed > log_size:
+            self.rebuild()
+        elif indexed < log_size:
+            self.replay(indexed)
+        if self.indexed_bytes() < log_size:
+            # Drop a record that was only partly written
+            os.truncate(self.log_path, self.indexed_bytes())
+        self.log = open(self.log_path, "ab")
+
+    def open_index(self):
+        size = INDEX_HEADER.size + INDEX_SLOTS * INDEX_ENTRY.size
+        fresh = not os.path.exists(self.index_path) or os.path.getsize(self.index_path) != size
+        with open(self.index_path, "r+b" if not fresh else "w+b") as f:
+            if fresh:
+                f.write(bytes(size))
+                f.flush()
+            index = mmap.mmap(f.fileno(), size)
+        magic, version, slots, _ = INDEX_HEADER.unpack_from(index, 0)
+        if magic != INDEX_MAGIC or version != INDEX_VERSION or slots != INDEX_SLOTS:
+            index[:] = bytes(size)
+            INDEX_HEADER.pack_into(index, 0, INDEX_MAGIC, INDEX_VERSION, INDEX_SLOTS, 0)
+        return index
+
+    def read_slots(self):
+        # difficulty name -> slot number, for the slots in use
+        slots = {}
+        for slot in range(INDEX_SLOTS):
+            name = INDEX_ENTRY.unpack_from(self.index, self.entry_offset(slot))[0].rstrip(b"\x00")
+            if name:
+                slots[name.decode()] = slot
+        return slots
+
+    def entry_offset(self, slot):
+        return INDEX_HEADER.size + slot * INDEX_ENTRY.size
+
+    def indexed_bytes(self):
+        return INDEX_HEADER.unpack_from(self.index, 0)[3]
+
+    def set_indexed_bytes(self, offset):
+        INDEX_HEADER.pack_into(self.index, 0, INDEX_MAGIC, INDEX_VERSION, INDEX_SLOTS, offset)
+
+    def record(self, difficulty, attempts, win, duration, guesses, finished_at=None):
+        name = difficulty.encode()[:255]
+        body = (RECORD_HEAD.pack(win, attempts, duration, finished_at or time.time())
+                + NAME_LENGTH.pack(len(name)) + name
+                + GUESS_COUNT.pack(len(guesses))
+                + b"".join(GUESS.pack(guess) for guess in guesses))
+        self.log.write(LENGTH.pack(len(body)) + body)
+        self.log.flush()
+        self.add_to_index(name.decode(), attempts, win, duration)
+        self.set_indexed_bytes(self.log.tell())
+
+    def record_round(self, game):
+        # Store a finished GameState from game_engine
+        guesses = [guess for guess, band in game.guess_history] + [game.last_guess]
+        self.record(round_name(game), game.attempts, game.win, game.duration, guesses)
+
+    def add_to_index(self, difficulty, attempts, win, duration):
+        if len(difficulty.encode()) > INDEX_NAME_BYTES:
+            return  # No exact name fits the index; the round is still in the log
+        slot = self.slots.get(difficulty)
+        if slot is None:
+            if len(self.slots) == INDEX_SLOTS:
+                return  # Index full; the round is still in the log
+            slot = self.slots[difficulty] = len(self.slots)
+        offset = self.entry_offset(slot)
+        _, rounds, wins, win_attempts, win_seconds, best_attempts, best_seconds = INDEX_ENTRY.unpack_from(self.index, offset)
+
+        rounds += 1
+        if win:
+            wins += 1
+            win_attempts += attempts
+            win_seconds += duration
+            best_attempts = attempts if wins == 1 else min(best_attempts, attempts)
+            best_seconds = duration if wins == 1 else min(best_seconds, duration)
+        INDEX_ENTRY.pack_into(self.index, offset, difficulty.encode(), rounds, wins,
+                              win_attempts, win_seconds, best_attempts, best_seconds)
+
+    def iter_log(self, offset=0):
+        # Yields (end offset, record) for each complete record from offset on
+        with open(self.log_path, "rb") as f:
+            f.seek(offset)
+            while True:
+                prefix = f.read(LENGTH.size)
+                if len(prefix) < LENGTH.size:
+                    return
+                length = LENGTH.unpack(prefix)[0]
+                body = f.read(length)
+                if len(body) < length:
+                    return
+                win, attempts, duration, finished_at = RECORD_HEAD.unpack_from(body, 0)
+                position = RECORD_HEAD.size
+                name_length = NAME_LENGTH.unpack_from(body, position)[0]
+                position += NAME_LENGTH.size
+                name = body[position:position + name_length].decode()
+                position += name_length
+                count = GUESS_COUNT.unpack_from(body, position)[0]
+                position += GUESS_COUNT.size
+                guesses = [GUESS.unpack_from(body, position + i * GUESS.size)[0] for i in range(count)]
+                offset = f.tell()
+                yield offset, {
+                    "difficulty": name, "attempts": attempts, "win": bool(win),
+                    "duration": duration, "finished_at": finished_at, "guesses": guesses,
+                }
+
+    def replay(self, offset):
+        if os.path.exists(self.log_path):
+            for offset, round_ in self.iter_log(offset):
+                self.add_to_index(round_["difficulty"], round_["attempts"], round_["win"], round_["duration"])
+        self.set_indexed_bytes(offset)
+
+    def rebuild(self):
+        self.index[INDEX_HEADER.size:] = bytes(INDEX_SLOTS * INDEX_ENTRY.size)
+        self.slots = {}
+        self.replay(0)
+
+    def leaderboard(self):
+        # Per-difficulty aggregates and best scores, straight from the index
+        board = {}
+        for difficulty, slot in self.slots.items():
+            _, rounds, wins, win_attempts, win_seconds, best_attempts, best_seconds = \
+                INDEX_ENTRY.unpack_from(self.index, self.entry_offset(slot))
+            board[difficulty] = {
+                "rounds": rounds,
+                "wins": wins,
+                "win_rate": wins / rounds if rounds else 0.0,
+                "mean_attempts": win_attempts / wins if wins else None,
+                "mean_seconds": win_seconds / wins if wins else None,
+                "best_attempts": best_attempts or None,
+                "best_seconds": best_seconds if wins else None,
+            }
+        return board
+
+    def close(self):
+        self.index.flush()
+        self.index.close()
+        self.log.close()
+
+
+if __name__ == "__main__":
+    store = StatsStore(sys.argv[1] if len(sys.argv) > 1 else DATA_DIR)
+    for difficulty, stats in store.leaderboard().items():
+        print(difficulty, stats)
+    store.close()
@@ -0,0 +1,186 @@
+import collections
+import json
+import os
+import sys
+import threading
+import time
+
+from game_engine import BANDS, LOSE, WIN
+
+FORMATS = ("jsonl", "prometheus")
+DEFAULT_PATHS = {"jsonl": "telemetry.jsonl", "prometheus": "telemetry.prom"}
+RESULTS = BANDS + (WIN, LOSE)
+
+
+class TelemetryExporter:
+    # Game events go into a bounded deque from the game thread and a background
+    # thread writes them out in batches, so emitting never waits on the disk.
+    # When the writer falls behind, new events are dropped and counted instead.
+    #
+    # jsonl:      one line per event, appended; the file is rotated at max_bytes
+    # prometheus: counters in the text exposition format, rewritten each batch
+    #             (point node_exporter's textfile collector at it; guesses per
+    #             second is rate(guessing_game_guesses_total))
+    def __init__(self, path=None, format="jsonl", capacity=10000, interval=1.0,
+                 max_bytes=10 * 1024 * 1024, backups=3):
+        if format not in FORMATS:
+            raise ValueError(f"format must be one of {', '.join(FORMATS)}")
+        self.path = path or DEFAULT_PATHS[format]
+        self.format = format
+        self.capacity = capacity
+        self.interval = interval
+        self.max_bytes = max_bytes
+        self.backups = backups
+
+        self.queue = collections.deque()
+        self.emitted = 0
+        self.dropped = 0
+        self.written = 0
+        self.failed = 0  # Events drained but lost to a write error
+        self.write_errors = 0
+        self.reported_drops = 0
+
+        # Running totals, only touched by the writer thread
+        self.guesses = collections.Counter()  # (difficulty, result) -> count
+        self.rounds = collections.Counter()  # difficulty -> rounds started
+        self.win_seconds = collections.defaultdict(float)  # difficulty -> time to win, summed
+
+        self.stopping = threading.Event()
+        self.thread = threading.Thread(target=self.run, name="telemetry", daemon=True)
+        self.thread.start()
+
+    # Game thread side
+
+    def emit(self, event):
+        # A length check and an append; deque appends are atomic, so no lock is taken
+        if len(self.queue) >= self.capacity:
+            self.dropped += 1
+            return
+        self.queue.append(event)
+        self.emitted += 1
+
+    def on_guess(self, game, result):
+        # Called by GameEngine.check_guess with the GameState and its return value
+        self.emit(("guess", time.time(), game.difficulty, result, game.attempts, game.duration))
+
+    def on_reset(self, game):
+        # Called by GameEngine.reset_game; only the start of a real round is an event
+        if game.difficulty:
+            self.emit(("round", time.time(), game.difficulty, None, 0, None))
+
+    # Writer thread side
+
+    def run(self):
+        while True:
+            stopping = self.stopping.wait(self.interval)
+            try:
+                self.flush()
+            except OSError as error:
+                # Keep the thread alive: a full disk may clear up, and the game must not notice
+                self.write_errors += 1
+                if self.write_errors == 1:
+                    print(f"telemetry: cannot write {self.path}: {error} (retrying every batch)", file=sys.stderr)
+            if stopping:
+                return
+
+    def drain(self):
+        queue = self.queue
+        batch = []
+        while queue:
+            batch.append(queue.popleft())
+        return batch
+
+    def flush(self):
+        # Read the drop counter once; the game thread keeps changing it while this runs
+        dropped = self.dropped
+        batch = self.drain()
+        for kind, _, difficulty, result, attempts, duration in batch:
+            if kind == "round":
+                self.rounds[difficulty] += 1
+            else:
+                self.guesses[difficulty, result] += 1
+                if result == WIN:
+                    self.win_seconds[difficulty] += duration
+
+        try:
+            if self.format == "jsonl":
+                self.write_jsonl(batch, dropped)
+            elif batch or dropped != self.reported_drops:
+                self.write_prometheus(dropped)
+        except OSError:
+            self.failed += len(batch)
+            raise  # Unreported drops stay pending for the next batch
+        self.written += len(batch)
+        self.reported_drops = dropped
+
+    def write_jsonl(self, batch, dropped):
+        lines = []
+        for kind, at, difficulty, result, attempts, duration in batch:
+            record = {"event": kind, "time": at, "difficulty": difficulty}
+            if kind == "guess":
+                record.update(result=result, attempts=attempts)
+                if duration is not None:
+                    record["seconds"] = duration  # Time to win or lose, on the round's last guess
+            lines.append(json.dumps(record))
+        if dropped != self.reported_drops:
+            lines.append(json.dumps({"event": "dropped", "time": time.time(), "count": dropped - self.reported_drops}))
+        if not lines:
+            return
+
+        self.rotate()
+        with open(self.path, "a") as f:
+            f.write("\n".join(lines) + "\n")
+
+    def rotate(self):
+        # telemetry.jsonl -> telemetry.jsonl.1 -> ... -> telemetry.jsonl.<backups>
+        if not os.path.exists(self.path) or os.path.getsize(self.path) < self.max_bytes:
+            return
+        for number in range(self.backups - 1, 0, -1):
+            older = f"{self.path}.{number}"
+            if os.path.exists(older):
+                os.replace(older, f"{self.path}.{number + 1}")
+        if self.backups:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+
+    def write_prometheus(self, dropped):
+        lines = [
+            "# HELP guessing_game_guesses_total Guesses made, by difficulty and result (band, WIN or LOSE).",
+            "# TYPE guessing_game_guesses_total counter",
+        ]
+        for (difficulty, result), count in sorted(self.guesses.items()):
+            lines.append(f'guessing_game_guesses_total{{difficulty="{difficulty}",result="{result}"}} {count}')
+        lines += [
+            "# HELP guessing_game_rounds_started_total Rounds started, by difficulty.",
+            "# TYPE guessing_game_rounds_started_total counter",
+        ]
+        for difficulty, count in sorted(self.rounds.items()):
+            lines.append(f'guessing_game_rounds_started_total{{difficulty="{difficulty}"}} {count}')
+        lines += [
+            "# HELP guessing_game_time_to_win_seconds Time from round start to the winning guess.",
+            "# TYPE guessing_game_time_to_win_seconds summary",
+        ]
+        for difficulty, seconds in sorted(self.win_seconds.items()):
+            lines.append(f'guessing_game_time_to_win_seconds_sum{{difficulty="{difficulty}"}} {seconds}')
+            lines.append(f'guessing_game_time_to_win_seconds_count{{difficulty="{difficulty}"}} {self.guesses[difficulty, WIN]}')
+        lines += [
+            "# HELP guessing_game_telemetry_dropped_events_total Events dropped because the exporter queue was full.",
+            "# TYPE guessing_game_telemetry_dropped_events_total counter",
+            f"guessing_game_telemetry_dropped_events_total {dropped}",
+        ]
+
+        # Written beside the target and renamed over it, so scrapers never see half a file
+        temporary = f"{self.path}.tmp"
+        with open(temporary, "w") as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(temporary, self.path)
+
+    def stats(self):
+        return {"emitted": self.emitted, "dropped": self.dropped, "written": self.written, "failed": self.failed,
+                "write_errors": self.write_errors, "queued": len(self.queue)}
+
+    def close(self):
+        # Stop the writer after one last batch
+        self.stopping.set()
+        self.thread.join()